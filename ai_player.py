@@ -9,10 +9,58 @@
 #-------------------------------------------------------------------------------
 
 import player_functions
+import search_cache
+from search_cache import EvalCache, TranspositionTable
+from opponent_model import OpponentModel
+from time_manager import TimeManager
 from sys import exit
 import random # need this to handle randomness
-import time # timing the player for testing purposes
-from math import pow # used to calculate max. depth of search
+import itertools
+import gc
+
+
+EVAL_CACHE_MB = 16 # memory allowed for cached scores (referee allows 100MB)
+EVAL_ENTRY_BYTES = 330 # approximate memory used by each cached score
+TABLE_MB = 16 # memory allowed for stored search results
+TABLE_ENTRY_BYTES = 450 # approximate memory used by each search result
+PLACE_HINTS_MB = 4 # memory allowed for best places remembered while placing
+PLACE_HINT_BYTES = 300 # approximate memory used by each remembered place
+PLACE_DEPTH_MAX = 6 # the deepest search allowed while placing
+PLACE_WIDTH = 12 # no. of places searched below the first ply while placing
+MOVE_DEPTH_MAX = 8 # the deepest search allowed while moving
+# assumed ratio of (my moves * enemy moves) to the extra cost of searching
+# two more plies while moving, used until the real ratio has been measured
+MOVE_GROWTH = 8
+SHRINK_HORIZON = 16 # turns before a shrink when pieces may be unable to escape
+NULL_REDUCTION = 2 # plies fewer searched after a null move (a pass)
+NULL_MIN_MOVES = 4 # fewest moves a side needs for a pass to be tried
+FUTILITY_MARGIN = 200 # most a quiet move is assumed to change the score by
+REPEAT_CONTEMPT = 20 # score given up by repeating a position, so lines which
+                     # make progress are preferred to shuffling back and forth
+KILLERS = 2 # quiet moves remembered for each turn, for causing cut-offs
+DEADLINE_NODES = 128 # nodes searched between checks of the turn's deadline
+# plies to reduce the search of late quiet moves by, by the plies left to
+# search (row) and the move's place in the order (column); the last entry of
+# a row is used for later moves, and the last row for deeper searches
+LMR_TABLE = [
+    [0], # no plies left
+    [0],
+    [0],
+    [0, 0, 0, 1], # from the fourth move on, search one ply less
+    [0, 0, 0, 1],
+    [0, 0, 0, 1, 1, 1, 2],
+]
+MOVE_OFFSETS = {"left": (-1,0), "right": (1,0), "up": (0,-1), "down": (0,1)}
+OFFSET_DIRECTIONS = {o: d for d, o in MOVE_OFFSETS.items()}
+# every move as a tuple, by the piece's location then direction, so that
+# generating moves doesn't need to make new ones
+MOVE_TUPLES = {(c, r): {d: (c, r, d) for d in MOVE_OFFSETS}
+    for c in range(8) for r in range(8)}
+ADJACENT = ((-1,0), (1,0), (0,-1), (0,1)) # offsets of neighbouring squares
+
+class SearchTimeout(Exception):
+    """Raised to abandon a search which has run past the turn's deadline"""
+    pass
 
 class Player:
     """Class for a 'good' AI player which behaves intelligently"""
@@ -26,13 +74,34 @@ class Player:
         self.colour = colour
         self.board = player_functions.board_init()
         self.placed = 0
-        self.time_passed = 0
-        self.b_alpha = -10000 # the best score determined in a move
-        self.b_sum = 0 # sum of beta values from possible enemy follow-up moves
-        self.b_mean = 0 # mean beta value from possible enemy follow-ups
+        self.timer = TimeManager() # budgets CPU time for each turn
+        self.p_turn = 0 # the turn of the latest placing search
+        # best places found by placing searches, least recently used
+        # forgotten first
+        self.p_hints = EvalCache(
+            int(PLACE_HINTS_MB * 1024 * 1024 / PLACE_HINT_BYTES))
+        self.o_model = OpponentModel() # replies expected from the opponent
         self.predictions = [] # a list of predicted best actions for opponent
-        self.op_turns = 0 # how many turns into moving phase opponent is
+        self.op_turns = 1 # opponent's moves judged (and an assumed optimal one)
         self.op_optimal = 1.0 # how 'optimally' opponent has played
+        self.e_cache = None # scores of evaluated boards (made on first use)
+        self.t_table = None # results of searches (made on first use)
+        self.null_move = False # whether to prune with null moves
+        self.futility = False # whether to prune quiet moves near the leaves
+        self.lmr = False # whether to search late quiet moves less deeply
+        self.repetition = True # whether to stop searching repeated positions
+        self.gc_control = True # whether to hold off garbage collection while
+                               # searching
+        self.null_line = False # whether searching after a null move
+        self.deadline = None # time at which to abandon the search, if any
+        self.counters = {'nodes': 0, 'null': 0, 'futility': 0,
+            'reductions': 0, 'researches': 0, 'repeats': 0,
+            'timeouts': 0} # search stats
+        # positions reached in the game and on the line being searched (board
+        # key and whether it is this player's turn), and how often each was
+        self.positions = {}
+        self.killers = {} # quiet moves which caused cut-offs, by turn
+        self.history = {} # how useful each quiet move has been in cut-offs
         if colour == 'white':
             self.my_piece = 'O'
             self.op_piece = '@'
@@ -55,7 +124,7 @@ class Player:
                 s = s + self.board[c][r] + " "
             print(s)
 
-    def piece_eval(self, board, row, col, turns, my_turn):
+    def piece_eval(self, board, row, col, turns, my_turn, threats=None):
         """
         Evauluate the heuristic value of a piece at a given position
 
@@ -64,14 +133,10 @@ class Player:
         :param col: the column to check
         :param turns: the number of turns which have passed in the moving phase
         :param my_turn: whether it is this player's turn at this board state
+        :param threats: the threat map of the board state, if already known
         :return: the heuristic value of the piece
         """
         shrinks = player_functions.get_shrinks(turns)
-        s_zone = [0,8] # safe zone (i.e. safe from shrinking)
-        if turns >= 108:
-            s_zone = [1,7]
-        if turns >= 172:
-            s_zone = [2,6]
         r_min = 0
         r_max = 8
         if board[col][row] == 'O':
@@ -84,8 +149,14 @@ class Player:
                 r_min = 2 # can't place below this
         else:
             return 0
+        if threats is None:
+            threats = player_functions.threat_map(board, shrinks)
+        t_map = threats[board[col][row]]
         # check how many enemies we are threatening
-        l_adjacent = [[-1,0],[1,0],[0,-1],[0,1]]
+        l_adjacent = ADJACENT
+        if t_map['nearest'].get((col,row), 16) > 1:
+            # no enemies adjacent
+            l_adjacent = ()
         t_enemies = 0 # no. of enemies this piece is threatening
         for l in l_adjacent:
             dx = col + l[0]
@@ -93,39 +164,22 @@ class Player:
             if player_functions.on_board(dy, dx, shrinks):
                 if board[dx][dy] == enemy:
                     # enemy here, is it under threat?
-                    l_threat = None
                     if dx == col:
                         # same column
-                        l_threat = player_functions.can_surround_vert(
-                            board, dy, dx)
-                    elif dy == row:
+                        l_threat = t_map['targets'][(dx,dy)][0]
+                    else:
                         # same row
-                        l_threat = player_functions.can_surround_hori(
-                            board, dy, dx)
+                        l_threat = t_map['targets'][(dx,dy)][1]
                     if l_threat is not None:
                         # check a piece is available to surround
                         if turns >= 0:
                             # moving phase
-                            for t in l_adjacent:
-                                # try a movement first
-                                tx = l_threat[0] + t[0]
-                                ty = l_threat[1] + t[1]
-                                if player_functions.on_board(ty, tx, shrinks):
-                                    if board[tx][ty] == board[col][row]:
-                                        # allied piece could take!
-                                        t_enemies += 1
-                                        continue
-                                # one can't just move there, try a jump
-                                tx += t[0]
-                                ty += t[1]
-                                if player_functions.on_board(ty, tx, shrinks):
-                                    if board[tx][ty] == board[col][row]:
-                                        # make sure position doesn't refer back
-                                        # to piece being evaluated
-                                        if (tx != col or ty != row):
-                                            # allied piece could take!
-                                            t_enemies += 1
-                                            continue
+                            for t in t_map['reach'][l_threat]:
+                                # make sure a jump doesn't start from the
+                                # piece being evaluated
+                                if not t[2] or t[0] != col or t[1] != row:
+                                    # allied piece could take!
+                                    t_enemies += 1
                         else:
                             # placing phase
                             if l_threat[1] in range(r_min,r_max):
@@ -142,14 +196,70 @@ class Player:
             val += 10*t_enemies
         return val
 
-    def evaluation(self, board, turns, my_turn):
+    def evaluation_key(self, board, turns):
+        """
+        Determines the key a board's score is cached under
+        Includes everything other than the board which affects the score
+
+        :param board: the board to check
+        :param turns: the number of turns which have passed in the moving phase
+        :return: a tuple which identifies the score
+        """
+        t_shrink = player_functions.shrink_next(turns)
+        if turns < 0 or t_shrink is None:
+            t_left = None
+        else:
+            # only matters for the last few turns before a shrink
+            t_left = min(t_shrink - turns, SHRINK_HORIZON)
+        return (player_functions.board_key(board),
+            player_functions.get_shrinks(turns), turns < 0,
+            turns in range(100, 128) or turns in range(176, 192),
+            t_left, int(10-9*self.op_optimal))
+
+    def search_key(self, board, my_turn, turns):
+        """
+        Determines the key a search result is stored under
+
+        :param board: the board state searched
+        :param my_turn: whether it is this player's turn
+        :param turns: how many turns into the moving phase we are
+        :return: a tuple which identifies the search result
+        """
+        return (player_functions.board_key(board), my_turn, turns,
+            int(10-9*self.op_optimal))
+
+    def evaluation(self, board, turns, my_turn, threats=None):
         """
         Provide a 'score' based on the input board state,
         compared with current board state
+        Scores are cached, so boards seen before are not evaluated again
 
         :param board: the board to check
         :param turns: the number of turns which have passed in the moving phase
         :param my_turn: whether it is this player's turn at this board state
+        :param threats: the threat map of the board state, if already known
+        :return: the calculated score - a higher value means a 'better' outcome
+        """
+        if self.e_cache is None:
+            # first evaluation, so create the cache now rather than on start-up
+            self.e_cache = EvalCache(
+                int(EVAL_CACHE_MB * 1024 * 1024 / EVAL_ENTRY_BYTES))
+        key = self.evaluation_key(board, turns)
+        score = self.e_cache.get(key)
+        if score is None:
+            score = self.evaluation_full(board, turns, my_turn, threats)
+            self.e_cache.put(key, score)
+        return score
+
+    def evaluation_full(self, board, turns, my_turn, threats=None):
+        """
+        Provide a 'score' based on the input board state, without using the
+        cache of previous scores
+
+        :param board: the board to check
+        :param turns: the number of turns which have passed in the moving phase
+        :param my_turn: whether it is this player's turn at this board state
+        :param threats: the threat map of the board state, if already known
         :return: the calculated score - a higher value means a 'better' outcome
         """
         allies = 0
@@ -157,18 +267,27 @@ class Player:
         score = 0
         a_score = 0
         e_score = 0
-        for c in range(8):
-            for r in range(8):
-                if board[c][r] == self.my_piece:
-                    allies += 1
-                    a_score += self.piece_eval(board, r, c, turns, my_turn)
-                elif board[c][r] == self.op_piece:
-                    enemies += 1
-                    e_score -= self.piece_eval(board, r, c, turns, my_turn)
+        if threats is None:
+            threats = player_functions.threat_map(
+                board, player_functions.get_shrinks(turns))
+        for (c, r) in board[player_functions.PIECES][self.my_piece]:
+            allies += 1
+            a_score += self.piece_eval(board, r, c, turns, my_turn, threats)
+        for (c, r) in board[player_functions.PIECES][self.op_piece]:
+            enemies += 1
+            e_score -= self.piece_eval(board, r, c, turns, my_turn, threats)
         # most important: having more pieces than opponent
         # doesn't really matter how many more/less pieces we have
         # if we're far enough ahead/behind
         score += (allies - enemies)*200
+        if turns >= 0:
+            # pieces which can't escape the next shrink are as good as lost
+            t_shrink = player_functions.shrink_next(turns)
+            if t_shrink is not None and t_shrink - turns < SHRINK_HORIZON:
+                score -= 200*player_functions.shrink_doomed(
+                    board, turns, self.my_piece)
+                score += 200*player_functions.shrink_doomed(
+                    board, turns, self.op_piece)
         score += a_score - e_score
         # during moving phase, check for end-game state
         if turns >= 0:
@@ -189,66 +308,123 @@ class Player:
         score = int(score/blur + 0.5) * blur
         return score
 
-    def place_next(self, board, my_turn, alpha, beta, depth, depth_max):
+    def place_candidates(self, board, my_turn, threats):
         """
-        Using alpha-beta pruning, find the best move to make next
+        Lists the places a piece could be put next, most promising first
+        Places which surround enemies come first, then places which stop
+        allied pieces being surrounded, then the rest. Places where the new
+        piece could itself be surrounded next turn come last
 
         :param board: the current board state to check
         :param my_turn: whether it is this player's placing turn
-        :param alpha: the current minimum score for maximising player
-        :param beta: the current maximum score for minimising player
-        :param depth: how deep the search is currently
-        :param depth_max: the maximum depth to search
-        :return: either alpha/beta if depth > 0, otherwise a list of best places
+        :param threats: the threat map of the board state
+        :return: a list of places (entry format [column,row])
         """
-        a, b = alpha, beta
-        if depth == depth_max:
-            return self.evaluation(board, -1, my_turn)
         r_min = 0
         r_max = 8
         if ((my_turn == True and self.colour == 'white')
                 or (my_turn == False and self.colour == 'black')):
             # white player placing
             r_max = 6
+            e_min, e_max = 2, 8 # where black can place
         else:
             # black player placing
             r_min = 2
-        p_best = [] # list of best placements
-        #p_best = None
-        a_place = [] # list of placees to put pieces
+            e_min, e_max = 0, 6 # where white can place
+        if my_turn:
+            p, e = self.my_piece, self.op_piece
+        else:
+            p, e = self.op_piece, self.my_piece
+        a_place = [] # list of places to put pieces
         for c in range(8):
             if r_min == 2:
                 # black player
-                for r in [4, 5, 3, 6, 2, 7]:
-                    if board[c][r] == '-':
-                        a_place.append([c,r])
+                rows = [4, 5, 3, 6, 2, 7]
             else:
                 # white player
-                for r in [3, 2, 4, 1, 5, 0]:
-                    if board[c][r] == '-':
-                        a_place.append([c,r])
+                rows = [3, 2, 4, 1, 5, 0]
+            for r in rows:
+                if board[c][r] != '-':
+                    continue
+                # how many enemies would be surrounded here?
+                p_val = 4*len(threats[p]['squares'].get((c,r), []))
+                # how many allies would be protected here?
+                p_val += 2*len(threats[e]['squares'].get((c,r), []))
+                if p_val == 0:
+                    # could the new piece be surrounded straight away?
+                    board[c][r] = p
+                    l_threat = player_functions.can_surround(board, r, c)
+                    board[c][r] = '-'
+                    if l_threat is not None and l_threat[1] in range(
+                            e_min, e_max):
+                        p_val = -1
+                a_place.append([c,r,p_val])
+        # sorting is stable, so rows keep oscillating about the middle
+        a_place.sort(key=lambda l: -l[2])
+        return [[l[0],l[1]] for l in a_place]
+
+    def place_next(self, board, my_turn, alpha, beta, depth, depth_max):
+        """
+        Using alpha-beta pruning, find the best move to make next
+        Below the first ply only the PLACE_WIDTH most promising places are
+        searched (see place_candidates)
+
+        :param board: the current board state to check
+        :param my_turn: whether it is this player's placing turn
+        :param alpha: the current minimum score for maximising player
+        :param beta: the current maximum score for minimising player
+        :param depth: how deep the search is currently
+        :param depth_max: the maximum depth to search
+        :return: either alpha/beta if depth > 0, otherwise a list of best places
+        :raises SearchTimeout: if the deadline passes during the search
+        """
+        self.counters['nodes'] += 1
+        if (self.deadline is not None
+                and self.counters['nodes'] % DEADLINE_NODES == 0
+                and self.timer.elapsed() > self.deadline):
+            raise SearchTimeout()
+        a, b = alpha, beta
+        if depth == depth_max:
+            return self.evaluation(board, -1, my_turn)
+        threats = player_functions.threat_map(board, 0)
+        a_place = self.place_candidates(board, my_turn, threats)
+        # try the best place found by earlier searches first
+        key = (self.p_turn + depth, player_functions.board_key(board))
+        hint = self.p_hints.get(key)
+        if hint is not None and hint in a_place:
+            a_place.remove(hint)
+            a_place.insert(0, hint)
+        if depth > 0:
+            a_place = a_place[:PLACE_WIDTH]
+        p_best = [] # list of best placements
+        p_hint = None # the best placement, remembered for later searches
         for p in a_place:
             c, r = p[0], p[1]
             # place a piece
             if my_turn:
                 n_board = player_functions.board_duplicate(board)
-                n_board[c][r] = self.my_piece
+                player_functions.piece_place(n_board, r, c, self.my_piece)
                 player_functions.eliminate(
                     n_board, self.op_piece, self.my_piece)
-                s = self.place_next(
-                    n_board, False, a, b, depth+1, depth_max)
+                if depth == 0:
+                    # widen the window slightly, so that a reply can only
+                    # match the best score so far if it is exactly equal
+                    s = self.place_next(
+                        n_board, False, a-1, b, depth+1, depth_max)
+                else:
+                    s = self.place_next(
+                        n_board, False, a, b, depth+1, depth_max)
                 n_board = None
                 if s == a:
                     p_best.append([c,r])
-                    #p_best = random.choice([p, p_best])
                 elif s > a:
                     a = s
-                    #p_best = p
+                    p_hint = p
                     p_best.clear()
                     p_best.append([c,r])
             else:
                 n_board = player_functions.board_duplicate(board)
-                n_board[c][r] = self.op_piece
+                player_functions.piece_place(n_board, r, c, self.op_piece)
                 player_functions.eliminate(
                     n_board, self.my_piece, self.op_piece)
                 s = self.place_next(
@@ -256,8 +432,11 @@ class Player:
                 n_board = None
                 if s < b:
                     b = s
+                    p_hint = p
             if b <= a:
                 break
+        if p_hint is not None:
+            self.p_hints.put(key, p_hint)
         if depth == 0:
             #print(a)
             return p_best
@@ -273,22 +452,75 @@ class Player:
         :param turns: the number of turns that have occured
         :return: a tuple if valid placement occurs, None otherwise
         """
-        # use a-b pruning
-        depth = min(max(1,24-turns),2)
-        p_best = self.place_next(self.board, True, -100000, 100000, 0, depth)
+        # use a-b pruning, searching deeper while time allows
+        self.p_turn = turns
+        budget = self.timer.budget(turns, True, self.placed)
+        d_max = min(max(1,24-turns),PLACE_DEPTH_MAX)
+        depth = min(d_max,2)
+        growth = PLACE_WIDTH
+        self.deadline = self.timer.deadline(budget)
+        p_best = None # best places found by the deepest completed search
+        try:
+            t_start = self.timer.elapsed()
+            p_best = self.place_next(
+                self.board, True, -100000, 100000, 0, depth)
+            t_last = self.timer.elapsed() - t_start
+            while depth < d_max:
+                # each extra ply multiplies the work by (at most) the no. of
+                # places
+                if self.timer.elapsed() - t_start + t_last*growth > budget:
+                    # wouldn't finish in time
+                    break
+                depth += 1
+                t_iter = self.timer.elapsed()
+                p_best = self.place_next(
+                    self.board, True, -100000, 100000, 0, depth)
+                t_next = self.timer.elapsed() - t_iter
+                if t_last > 0.01:
+                    # measured how much longer the deeper search took
+                    growth = max(t_next/t_last, 1)
+                t_last = t_next
+        except SearchTimeout:
+            # out of time, so keep the places found by the last search which
+            # finished, or else the most promising place
+            self.counters['timeouts'] += 1
+            if p_best is None:
+                threats = player_functions.threat_map(self.board, 0)
+                p_best = self.place_candidates(self.board, True, threats)[:1]
+        self.deadline = None
+        #print("Depth of placing search: " + str(depth))
         n_place = random.choice(p_best)
         #n_place = p_best
-        self.board[n_place[0]][n_place[1]] = self.my_piece
+        player_functions.piece_place(
+            self.board, n_place[1], n_place[0], self.my_piece)
         player_functions.eliminate(self.board, self.op_piece, self.my_piece)
         return (n_place[0], n_place[1])
 
-    def moves_generate(self, board, my_turn, shrinks):
+    def moves_tables(self, board, shrinks):
+        """
+        Builds the move tables for both players at a board state
+
+        :param board: the board state to check
+        :param shrinks: the number of times the board has shrunk
+        :return: a list of move tables, for this player then the opponent
+        """
+        return [player_functions.moves_table(board, self.my_piece, shrinks),
+            player_functions.moves_table(board, self.op_piece, shrinks)]
+
+    def moves_generate(self, board, my_turn, shrinks, table=None,
+            threats=None, doomed=None):
         """
         Generates a list of moves that could occur next
+        Moves which surround an enemy piece are listed first, if the threat map
+        of the board state is provided
 
         :param board: the board state to check
         :param my_turn: whether it is this player's turn
         :param shrinks: the number of times the board has shrunk
+        :param table: the move table of the player to move, if already known
+        :param threats: the threat map of the board state, if already known
+        :param doomed: a set of squares which moves shouldn't end on, unless
+            they surround an enemy piece, or no other moves are possible
         :return: a list of possible moves (entry format [column,row,direction])
         """
         # first find the right pieces
@@ -296,36 +528,181 @@ class Player:
             p_check = self.my_piece
         else:
             p_check = self.op_piece
-        p_locations = []
-        for c in range(8):
-            for r in range(8):
-                if board[c][r] == p_check:
-                    # appropriate piece found
-                    dist = player_functions.dist_enemy(board, r, c)
-                    # add in order of increasing distance
-                    if dist != -1:
-                        i = 0
-                        while i < len(p_locations):
-                            if dist < p_locations[i][2]:
-                                p_locations.insert(i, [c,r,dist])
-                                break
-                            i += 1
-                        if i == len(p_locations):
-                            # add to end of list instead
-                            p_locations.append([c,r,dist])
-        dirs = ["left","right","up","down"]
+        if table is None:
+            table = player_functions.moves_table(board, p_check, shrinks)
+        if threats is not None:
+            nearest = threats[p_check]['nearest']
+        else:
+            nearest = player_functions.enemy_distances(board)[p_check]
+        # pieces which can move, in order of increasing distance from an enemy
+        p_locations = [[l[0],l[1],nearest[l]] for l in sorted(table)
+            if len(table[l]) > 0 and l in nearest]
+        p_locations.sort(key=lambda l: l[2])
         moves = []
+        captures = []
+        pruned = [] # moves onto doomed squares
+        if threats is not None:
+            t_squares = threats[p_check]['squares']
+        else:
+            t_squares = {}
+        if doomed is None:
+            doomed = set()
+        offsets = {"left": (-1,0), "right": (1,0), "up": (0,-1), "down": (0,1)}
         for l in p_locations:
-            # now see if we can move these pieces
-            for d in dirs:
-                # check this direction, add it if we can move or jump
-                if player_functions.can_move(board, l[1], l[0], shrinks, d):
-                    moves.append([l[0], l[1], d])
-                elif player_functions.can_jump(board, l[1], l[0], shrinks, d):
-                    moves.append([l[0], l[1], d])
-        return moves
+            # these pieces are known to be able to move
+            for d in table[(l[0],l[1])]:
+                if len(t_squares) > 0 or len(doomed) > 0:
+                    # check where this move ends up
+                    o = offsets[d]
+                    n = (l[0]+o[0], l[1]+o[1])
+                    if board[n[0]][n[1]] != '-':
+                        # must be a jump instead
+                        n = (n[0]+o[0], n[1]+o[1])
+                    if n in t_squares:
+                        # could surround an enemy, try this early
+                        captures.append([l[0], l[1], d])
+                        continue
+                    if n in doomed:
+                        # will be lost to the shrink, don't bother
+                        pruned.append([l[0], l[1], d])
+                        continue
+                moves.append([l[0], l[1], d])
+        if len(captures) == 0 and len(moves) == 0:
+            # nowhere safe to go, so consider every move after all
+            return pruned
+        return captures + moves
+
+    def moves_staged(self, board, my_turn, turns, table, threats, doomed=None,
+            hint=None):
+        """
+        Generates the moves that could occur next, in stages, so that later
+        stages are only worked out if the search gets to them:
+        the hint (the best move found by an earlier search), moves which
+        surround an enemy piece, killer moves (see moves_killer), then the
+        remaining moves by how useful they have been (see self.history) and
+        how close the piece is to an enemy
+
+        :param board: the board state to check
+        :param my_turn: whether it is this player's turn
+        :param turns: how many turns into the moving phase we are
+        :param table: the move table of the player to move
+        :param threats: the threat map of the board state
+        :param doomed: a set of squares which moves shouldn't end on, unless
+            they surround an enemy piece, or no other moves are possible
+        :param hint: the move to try first, if legal
+        :return: a generator of moves (entry format (column,row,direction),
+            see MOVE_TUPLES)
+        """
+        if my_turn:
+            p_check = self.my_piece
+        else:
+            p_check = self.op_piece
+        t_map = threats[p_check]
+        if doomed is None:
+            doomed = set()
+        done = set() # moves already generated, as (column,row,direction)
+
+        def landing(c, r, d):
+            # the square a move ends on
+            o = MOVE_OFFSETS[d]
+            n = (c+o[0], r+o[1])
+            if board[n[0]][n[1]] != '-':
+                # must be a jump instead
+                n = (n[0]+o[0], n[1]+o[1])
+            return n
+
+        if hint is not None and hint[2] in table.get((hint[0],hint[1]), ()):
+            n = landing(hint[0], hint[1], hint[2])
+            if n in t_map['squares'] or n not in doomed:
+                hint = MOVE_TUPLES[(hint[0],hint[1])][hint[2]]
+                done.add(hint)
+                yield hint
+        # moves which surround an enemy piece
+        for n, reach in t_map['reach'].items():
+            for (c, r, jump) in reach:
+                if (c,r) not in t_map['nearest']:
+                    continue
+                step = 2 if jump else 1
+                d = OFFSET_DIRECTIONS[((n[0]-c)//step, (n[1]-r)//step)]
+                m = MOVE_TUPLES[(c,r)][d]
+                if (m not in done and d in table.get((c,r), ())
+                        and landing(c, r, d) == n):
+                    done.add(m)
+                    yield m
+        # moves which caused cut-offs elsewhere on this turn
+        for m in self.killers.get((my_turn, turns), ()):
+            if (m not in done and m[2] in table.get((m[0],m[1]), ())
+                    and (m[0],m[1]) in t_map['nearest']
+                    and landing(m[0], m[1], m[2]) not in doomed):
+                done.add(m)
+                yield m
+        # everything else
+        p_locations = [l for l in sorted(table)
+            if len(table[l]) > 0 and l in t_map['nearest']]
+        p_locations.sort(key=lambda l: t_map['nearest'][l])
+        moves = []
+        pruned = [] # moves onto doomed squares
+        for (c, r) in p_locations:
+            l_moves = MOVE_TUPLES[(c,r)]
+            for d in table[(c,r)]:
+                m = l_moves[d]
+                if m in done:
+                    continue
+                n = landing(c, r, d)
+                if n in doomed and n not in t_map['squares']:
+                    # will be lost to the shrink, don't bother
+                    pruned.append(m)
+                else:
+                    moves.append(m)
+        moves.sort(key=lambda m: -self.history.get((my_turn,) + m, 0))
+        for m in moves:
+            yield m
+        if len(done) == 0 and len(moves) == 0:
+            # nowhere safe to go, so consider every move after all
+            for m in pruned:
+                yield m
+
+    def moves_killer(self, m, my_turn, turns, depth, depth_max):
+        """
+        Remembers a quiet move (one which eliminates nothing) which caused a
+        cut-off, so that it is tried early in other positions on this turn,
+        and in positions where it is legal in later searches
+
+        :param m: the move (entry format (column,row,direction))
+        :param my_turn: whether it was this player's turn
+        :param turns: how many turns into the moving phase it was made
+        :param depth: how deep the search was
+        :param depth_max: the maximum depth of the search
+        """
+        l_killers = self.killers.setdefault((my_turn, turns), [])
+        if m not in l_killers:
+            l_killers.insert(0, m)
+            del l_killers[KILLERS:]
+        key = (my_turn,) + m
+        self.history[key] = (self.history.get(key, 0)
+            + (depth_max - depth)*(depth_max - depth))
 
-    def move_next(self, board, my_turn, turns, alpha, beta, depth, depth_max):
+    def moves_tables_next(self, tables, board, shrinks, n_shrinks, changed):
+        """
+        Determines the move tables for a board state following a move
+
+        :param tables: the move tables before the move (see moves_tables)
+        :param board: the board state after the move
+        :param shrinks: the number of times the board had shrunk before the move
+        :param n_shrinks: the number of times the board has shrunk after the move
+        :param changed: a list of the (column,row) locations which changed
+        :return: the updated move tables, or None if they must be rebuilt
+        """
+        if tables is None or shrinks != n_shrinks:
+            # shrinking changes too much of the board to update
+            return None
+        return [player_functions.moves_table_update(dict(tables[0]), board,
+                self.my_piece, shrinks, changed),
+            player_functions.moves_table_update(dict(tables[1]), board,
+                self.op_piece, shrinks, changed)]
+
+    def move_next(self, board, my_turn, turns, alpha, beta, depth, depth_max,
+            tables=None):
         """
         Using alpha-beta pruning, find the best move to make next
 
@@ -336,12 +713,55 @@ class Player:
         :param beta: the current maximum score for minimising player
         :param depth: how deep the search is currently
         :param depth_max: the maximum depth to search
+        :param tables: the move tables of the board state, if already known
         :return: either alpha/beta if depth > 0, otherwise a list of best moves
+        :raises SearchTimeout: if the deadline passes during the search
         """
+        self.counters['nodes'] += 1
+        if (self.deadline is not None
+                and self.counters['nodes'] % DEADLINE_NODES == 0
+                and self.timer.elapsed() > self.deadline):
+            raise SearchTimeout()
         a, b = alpha, beta
         shrinks = player_functions.get_shrinks(turns)
         n_shrinks = player_functions.get_shrinks(turns+1)
-        c_score = self.evaluation(board, turns, my_turn)
+        key = None
+        hint = None # best move found by an earlier search
+        threats = None
+        c_score = None
+        if depth == 2:
+            # the opponent's reply to a move at the root, recorded before the
+            # table is probed so that replies already in the table count too
+            if depth < depth_max:
+                threats = player_functions.threat_map(board, shrinks)
+            c_score = self.evaluation(board, turns, my_turn, threats)
+            self.o_model.record(c_score)
+        if depth < depth_max:
+            key = self.search_key(board, my_turn, turns)
+        p_key = None
+        repeated = False # whether the position is on this line, or was played
+        repeats = self.counters['repeats'] # repeats found before this node
+        if self.repetition:
+            if key is None:
+                p_key = (player_functions.board_key(board), my_turn)
+            else:
+                p_key = key[:2]
+            repeated = depth > 0 and p_key in self.positions
+        if depth < depth_max:
+            if self.t_table is None:
+                self.t_table = TranspositionTable(
+                    int(TABLE_MB * 1024 * 1024 / TABLE_ENTRY_BYTES))
+            t_score, hint = self.t_table.probe(key, depth_max - depth, a, b)
+            if t_score is not None and depth > 1 and not repeated:
+                # already searched deeply enough (but the replies to each
+                # move at the root are always searched, for the opponent
+                # model, and a repeated position is always scored as one)
+                return t_score
+        if depth < depth_max and threats is None:
+            # needed for ordering moves as well as evaluation
+            threats = player_functions.threat_map(board, shrinks)
+        if c_score is None:
+            c_score = self.evaluation(board, turns, my_turn, threats)
         if c_score <= -2500 and depth > 0:
             # lose/draw state
             return (c_score + depth)
@@ -350,41 +770,106 @@ class Player:
             #if depth == 1:
             #    print("About to win!!!")
             return (c_score - depth)
+        if repeated:
+            # reached before, so the moves since have been wasted
+            self.counters['repeats'] += 1
+            return c_score - REPEAT_CONTEMPT
         if depth == depth_max:
             return c_score
-        if depth == 0 and not my_turn:
-            # checking enemy best moves
-            self.b_sum = 0
-        l_moves = self.moves_generate(board, my_turn, shrinks)
+        if tables is None:
+            tables = self.moves_tables(board, shrinks)
+        self.positions_add(p_key)
+        doomed = None
+        t_shrink = player_functions.shrink_next(turns)
+        if t_shrink is not None and t_shrink <= turns + depth_max - depth:
+            # the board will shrink within the search, so ignore moves onto
+            # squares it will remove
+            doomed = player_functions.shrink_doomed_squares(shrinks)
+        if (self.null_move and depth > 0 and not self.null_line
+                and doomed is None and depth_max - depth > NULL_REDUCTION):
+            # if passing would still leave the score outside the window,
+            # assume some move would too. Not tried near a shrink, or with
+            # few moves, where being forced to move can be what loses
+            s = self.null_next(board, my_turn, turns, a, b, c_score, depth,
+                depth_max, tables)
+            if s is not None:
+                self.counters['null'] += 1
+                self.positions_remove(p_key)
+                return s
+        futile = False # whether quiet moves can't bring the score into window
+        if (self.futility and depth > 0 and depth_max - depth == 1
+                and doomed is None and shrinks == n_shrinks):
+            if my_turn:
+                futile = c_score + FUTILITY_MARGIN <= a
+            else:
+                futile = c_score - FUTILITY_MARGIN >= b
+        if my_turn:
+            l_moves = self.moves_staged(
+                board, my_turn, turns, tables[0], threats, doomed, hint)
+        else:
+            l_moves = self.moves_staged(
+                board, my_turn, turns, tables[1], threats, doomed, hint)
+        m_first = next(l_moves, None)
         # check that a move is possible
-        if len(l_moves) == 0:
+        if m_first is None:
             # no moves possible
             n_board = player_functions.board_duplicate(board)
             # shrink and eliminate, if necessary
             if n_shrinks != shrinks:
                 player_functions.shrink(n_board, n_shrinks)
+            if depth < 2:
+                self.o_model.line[depth] = None
             n_score = self.move_next(n_board, not my_turn, turns+1, a, b,
                 depth+1, depth_max)
             n_board = None
+            self.positions_remove(p_key)
             if depth > 0:
                 return n_score
             else:
-                self.b_sum = n_score
                 return None
         m_best = [] # list of best moves, return if depth == 0 instead of score
-        for m in l_moves:
+        m_hint = None # the best move, remembered for later searches
+        l_reduce = None # reductions for late moves (None if not allowed)
+        if (self.lmr and depth >= 2 and doomed is None
+                and shrinks == n_shrinks):
+            # not for root moves or replies to them (see OpponentModel), nor
+            # where the board is about to shrink
+            l_reduce = LMR_TABLE[min(depth_max - depth, len(LMR_TABLE)-1)]
+            threatened = self.threatened(threats, my_turn)
+        for i, m in enumerate(itertools.chain([m_first], l_moves)):
             n_board = player_functions.board_duplicate(board)
             res = player_functions.move_perform(
                 n_board, m[1], m[0], shrinks, m[2])
+            changed = [(m[0],m[1]), res]
+            if depth < 2:
+                self.o_model.line[depth] = ((m[0],m[1]), res)
             if my_turn:
                 player_functions.eliminate(
-                    n_board, self.op_piece, self.my_piece)
+                    n_board, self.op_piece, self.my_piece, changed)
+                if futile and len(changed) == 2:
+                    # nothing eliminated, so not worth searching
+                    self.counters['futility'] += 1
+                    continue
                 if shrinks != n_shrinks:
                     player_functions.shrink(n_board, n_shrinks)
-                s = self.move_next(
-                    n_board, False, turns+1, a, b, depth+1, depth_max)
+                n_tables = self.moves_tables_next(
+                    tables, n_board, shrinks, n_shrinks, changed)
+                s = None
+                if (l_reduce is not None and len(changed) == 2
+                        and (m[0],m[1]) not in threatened):
+                    s = self.move_reduced(n_board, my_turn, turns, a, b,
+                        depth, depth_max, n_tables, l_reduce, i)
+                if depth == 0:
+                    # widen the window slightly, so that a reply can only
+                    # match the best score so far if it is exactly equal
+                    s = self.move_next(n_board, False, turns+1, a-1, b,
+                        depth+1, depth_max, n_tables)
+                elif s is None:
+                    s = self.move_next(n_board, False, turns+1, a, b,
+                        depth+1, depth_max, n_tables)
                 if s > a:
                     a = s
+                    m_hint = m
                     if depth == 0:
                         m_best.clear()
                         m_best.append(m)
@@ -396,29 +881,186 @@ class Player:
                     #    print("Also: " + str(m))
             else:
                 player_functions.eliminate(
-                    n_board, self.my_piece, self.op_piece)
+                    n_board, self.my_piece, self.op_piece, changed)
+                if futile and len(changed) == 2:
+                    # nothing eliminated, so not worth searching
+                    self.counters['futility'] += 1
+                    continue
                 if shrinks != n_shrinks:
                     player_functions.shrink(n_board, n_shrinks)
-                s = self.move_next(
-                    n_board, True, turns+1, a, b, depth+1, depth_max)
-                if depth == 0:
-                    m_best.append(m)
-                    self.b_sum += s
+                n_tables = self.moves_tables_next(
+                    tables, n_board, shrinks, n_shrinks, changed)
+                s = None
+                if (l_reduce is not None and len(changed) == 2
+                        and (m[0],m[1]) not in threatened):
+                    s = self.move_reduced(n_board, my_turn, turns, a, b,
+                        depth, depth_max, n_tables, l_reduce, i)
+                if s is None:
+                    s = self.move_next(n_board, True, turns+1, a, b,
+                        depth+1, depth_max, n_tables)
                 if s < b:
                     b = s
+                    m_hint = m
             n_board = None
             if b <= a:
+                if len(changed) == 2:
+                    self.moves_killer(m, my_turn, turns, depth, depth_max)
                 break
-        if depth == 0:
-            if len(l_moves) > 0:
-                return m_best
+        # remember the result, bounded by the window it was searched with
+        if my_turn:
+            score = a
+            if a >= b:
+                flag = search_cache.LOWER
+            elif a > alpha or depth == 0:
+                flag = search_cache.EXACT
             else:
-                return None
+                flag = search_cache.UPPER
+        else:
+            score = b
+            if b <= a:
+                flag = search_cache.UPPER
+            elif b < beta:
+                flag = search_cache.EXACT
+            else:
+                flag = search_cache.LOWER
+        if abs(score) >= 2400:
+            # scores of won/lost games depend on the depth they're found at
+            score = None
+        elif self.counters['repeats'] != repeats:
+            # the score depends on the positions reached on the way here,
+            # which another line to this node needn't share
+            score = None
+        self.t_table.store(key, depth_max - depth, score, flag, m_hint)
+        self.positions_remove(p_key)
+        if depth == 0:
+            return m_best
         if my_turn:
             return a
         else:
             return b
 
+    def positions_add(self, p_key):
+        """
+        Record that a position has been reached, in the game or the search
+
+        :param p_key: the position (see self.positions), or None to ignore
+        """
+        if p_key is not None:
+            self.positions[p_key] = self.positions.get(p_key, 0) + 1
+
+    def positions_remove(self, p_key):
+        """
+        Forget one occurrence of a position, once the search has left it
+
+        :param p_key: the position (see self.positions), or None to ignore
+        """
+        if p_key is None:
+            return
+        n = self.positions[p_key] - 1
+        if n == 0:
+            del self.positions[p_key]
+        else:
+            self.positions[p_key] = n
+
+    def threatened(self, threats, my_turn):
+        """
+        Finds the pieces of the player to move which could be surrounded by
+        the opponent's next move
+
+        :param threats: the threat map of the board state
+        :param my_turn: whether it is this player's turn
+        :return: a set of the pieces' locations (column,row)
+        """
+        if my_turn:
+            t_map = threats[self.op_piece]
+        else:
+            t_map = threats[self.my_piece]
+        threatened = set()
+        for l, l_threat in t_map['targets'].items():
+            for n in l_threat:
+                if n is not None and len(t_map['reach'][n]) > 0:
+                    threatened.add(l)
+        return threatened
+
+    def move_reduced(self, n_board, my_turn, turns, alpha, beta, depth,
+            depth_max, n_tables, l_reduce, i):
+        """
+        Search the board state after a late quiet move less deeply, with a
+        null window, to see whether it can be worse than the best move so far
+        without a full search
+
+        :param n_board: the board state after the move
+        :param my_turn: whether it was this player's turn to move
+        :param turns: how many turns into the moving phase the move was made
+        :param alpha: the current minimum score for maximising player
+        :param beta: the current maximum score for minimising player
+        :param depth: how deep the search was when the move was made
+        :param depth_max: the maximum depth to search
+        :param n_tables: the move tables of the board state after the move
+        :param l_reduce: the row of LMR_TABLE to use
+        :param i: the move's place in the order of moves
+        :return: the score of the move, or None if it needs a full search
+        """
+        r = min(l_reduce[min(i, len(l_reduce)-1)], depth_max - depth - 2)
+        if r <= 0:
+            return None
+        self.counters['reductions'] += 1
+        if my_turn:
+            s = self.move_next(n_board, False, turns+1, alpha, alpha+1,
+                depth+1+r, depth_max, n_tables)
+            if s <= alpha:
+                return s
+        else:
+            s = self.move_next(n_board, True, turns+1, beta-1, beta,
+                depth+1+r, depth_max, n_tables)
+            if s >= beta:
+                return s
+        # might be better than expected
+        self.counters['researches'] += 1
+        return None
+
+    def null_next(self, board, my_turn, turns, alpha, beta, c_score, depth,
+            depth_max, tables):
+        """
+        Search (less deeply) as if the player to move passed instead, to see
+        whether the position is already good enough that it needn't be searched
+
+        :param board: the current board state to check
+        :param my_turn: whether it is this player's turn
+        :param turns: how many turns into the moving phase we are
+        :param alpha: the current minimum score for maximising player
+        :param beta: the current maximum score for minimising player
+        :param c_score: the score of the board state
+        :param depth: how deep the search is currently
+        :param depth_max: the maximum depth to search
+        :param tables: the move tables of the board state
+        :return: the score to cut the search off with, or None if it must be
+            searched as normal
+        """
+        if my_turn:
+            table = tables[0]
+            if c_score < beta:
+                return None
+        else:
+            table = tables[1]
+            if c_score > alpha:
+                return None
+        if player_functions.moves_count(table) < NULL_MIN_MOVES:
+            return None
+        self.null_line = True # no further null moves below this one
+        if my_turn:
+            s = self.move_next(board, False, turns+1, beta-1, beta,
+                depth+1+NULL_REDUCTION, depth_max, tables)
+        else:
+            s = self.move_next(board, True, turns+1, alpha, alpha+1,
+                depth+1+NULL_REDUCTION, depth_max, tables)
+        self.null_line = False
+        if my_turn and s >= beta:
+            return beta
+        if not my_turn and s <= alpha:
+            return alpha
+        return None
+
     def move(self, turns):
         """
         Have a player attempt a move, assuming one is possible
@@ -426,42 +1068,64 @@ class Player:
         :param turns: the number of turns into the moving phase we are
         :return: a tuple of tuples for a valid move
         """
-        if turns > 1:
-            c_score = self.evaluation(self.board, turns, True)
-            #print(c_score)
-            self.op_optimal = int(self.op_optimal*self.op_turns + 0.5)
-            if c_score < self.b_mean - abs(self.b_mean/10):
-                # opponent playing well
-                self.op_optimal += 1
-            self.op_turns += 1
-            self.op_optimal /= self.op_turns
-            #print(self.op_optimal)
-        else:
-            self.op_turns += 1
         shrinks = player_functions.get_shrinks(turns)
-        my_moves = player_functions.moves_available(
-            self.board, self.my_piece, shrinks)
-        op_moves = player_functions.moves_available(
-            self.board, self.op_piece, shrinks)
-        # average time to make a move
-        if turns > 1:
-            t_average = max(self.time_passed/int(turns/2), 0.05)
-        else:
-            t_average = 0.2 # one-fifth second (default for first move)
-        # assume
+        tables = self.moves_tables(self.board, shrinks)
+        my_moves = player_functions.moves_count(tables[0])
+        op_moves = player_functions.moves_count(tables[1])
+        # more time is allowed when pieces could be taken
+        threats = player_functions.threat_map(self.board, shrinks)
+        tactical = False
+        for p in [self.my_piece, self.op_piece]:
+            for reach in threats[p]['reach'].values():
+                if len(reach) > 0:
+                    tactical = True
+        budget = self.timer.budget(turns, False, self.placed, tactical)
+        # search deeper while the next search is expected to finish in time
         d_max = 2
-        t_max = 20000 # try to keep running time complexity below this
-        # lower allowed running time based on how long has passed in the game
-        t_max = max(t_max * 0.2/t_average, 3000)
-        # assume branching factor, b_factor, is average of total moves per team
-        while d_max < 8 and (pow(my_moves, int((d_max+2)/2+0.5))
-                * pow(op_moves, int((d_max+2)/2)) <= t_max):
-            # we can go further, increase depth
-            d_max += 2
-        l_moves = []
+        growth = max(my_moves*op_moves/MOVE_GROWTH, 1)
+        self.o_model.clear()
+        # forget killers from earlier turns, and let old history fade
+        self.killers = {k: v for k, v in self.killers.items() if k[1] > turns}
+        for k in self.history:
+            self.history[k] //= 2
+        self.deadline = self.timer.deadline(budget)
+        positions = dict(self.positions)
+        d_done = 0 # depth of the deepest completed search
+        try:
+            t_start = self.timer.elapsed()
+            l_moves = self.move_next(
+                self.board, True, turns, -100000, 100000, 0, d_max, tables)
+            d_done = d_max
+            t_last = self.timer.elapsed() - t_start
+            while l_moves is not None and d_max < MOVE_DEPTH_MAX:
+                if self.timer.elapsed() - t_start + t_last*growth > budget:
+                    # wouldn't finish in time
+                    break
+                d_max += 2
+                t_iter = self.timer.elapsed()
+                l_moves = self.move_next(self.board, True, turns,
+                    -100000, 100000, 0, d_max, tables)
+                d_done = d_max
+                t_next = self.timer.elapsed() - t_iter
+                if t_last > 0.01:
+                    # measured how much longer the deeper search took
+                    growth = max(t_next/t_last, 1)
+                t_last = t_next
+        except SearchTimeout:
+            # out of time, so keep the moves found by the last search which
+            # finished. Only finished nodes were stored, but the line being
+            # searched must be forgotten
+            self.counters['timeouts'] += 1
+            self.positions = positions
+            self.null_line = False
+            if d_done == 0:
+                # not even the shallowest search finished, so make the move
+                # which would have been searched first
+                m = next(self.moves_staged(self.board, True, turns,
+                    tables[0], threats), None)
+                l_moves = None if m is None else [m]
+        self.deadline = None
         #print("Depth of search: " + str(d_max))
-        l_moves = self.move_next(
-            self.board, True, turns, -100000, 100000, 0, d_max)
         if l_moves is None:
             return None
         s_best = -10000
@@ -469,19 +1133,10 @@ class Player:
         n_pos = player_functions.move_perform(
             self.board, f_move[1], f_move[0], shrinks, f_move[2])
         player_functions.eliminate(self.board, self.op_piece, self.my_piece)
-        # try to predict next moves by opponent
-        self.predictions.clear()
-        op_best = self.move_next(
-            self.board, False, turns+1, self.b_alpha, 10000, 0, 1)
-        if type(op_best) == list:
-            if len(op_best) > 1:
-                self.b_mean = self.b_sum / len(op_best)
-            else:
-                self.b_mean = self.b_sum
-        else:
-            self.b_mean = self.b_sum
-        #print(self.b_mean)
-        #print(self.b_sum)
+        self.positions_add((player_functions.board_key(self.board), False))
+        # predict the opponent's next moves from the replies searched
+        self.predictions = self.o_model.predict(
+            ((f_move[0], f_move[1]), n_pos), turns+1)
         return ((f_move[0], f_move[1]), n_pos)
 
     def update(self, action):
@@ -490,12 +1145,34 @@ class Player:
 
         :param action: the opponent's last move
         """
-        t_start = time.time()
+        self.timer.start()
         player_functions.update(
             self.board, action, self.my_piece, self.op_piece)
-        self.time_passed += time.time() - t_start
+        if self.placed >= 12:
+            self.positions_add((player_functions.board_key(self.board), True))
+        if self.o_model.expected is not None:
+            # judge the opponent's reply against those the search expected
+            c_score = self.o_model.observe(action)
+            if c_score is None:
+                c_score = self.evaluation(
+                    self.board, self.o_model.turns + 1, True)
+            self.op_optimal = int(self.op_optimal*self.op_turns + 0.5)
+            if self.o_model.played_well(c_score):
+                # opponent playing well
+                self.op_optimal += 1
+            self.op_turns += 1
+            self.op_optimal /= self.op_turns
+        if self.placed < 12:
+            # forget places found for turns which have now passed
+            for key in list(self.p_hints.entries):
+                if key[0] <= self.p_turn + 1:
+                    del self.p_hints.entries[key]
+        elif len(self.p_hints.entries) > 0:
+            # placing phase is over
+            self.p_hints.clear()
+        self.timer.stop()
         #print("Time (" + self.colour + "): "
-        #    + str(self.time_passed) + " seconds")
+        #    + str(self.timer.used) + " seconds")
 
     def action(self, turns):
         """
@@ -504,7 +1181,7 @@ class Player:
         :param turns: the number of turns which have passed so far
         :return: the move which occured, assuming one did
         """
-        t_start = time.time()
+        self.timer.start()
         #print("Turn " + str(turns + 1))
         r_val = None # return value
         # know how many times board has shrunk
@@ -516,28 +1193,38 @@ class Player:
             # 96 turns have passed for each player
             player_functions.shrink(self.board,shrinks)
         player_functions.eliminate(self.board, self.my_piece, self.op_piece)
-        if self.placed < 12:
-            # placing phase
-            r_val = self.place(turns)
-            player_functions.eliminate(self.board, self.op_piece, self.my_piece)
-            self.placed += 1
-        else:
-            # moving phase
-            # check if can do anything
-            # FOR TESTING: Force abortion!
-            #exit()
-            m = player_functions.moves_available(
-                self.board,self.my_piece,shrinks)
-            if m == 0:
-                r_val = None
+        gc_enabled = gc.isenabled()
+        if self.gc_control:
+            # the search's short-lived objects are freed as soon as they're
+            # done with, so don't pause it to look for garbage cycles
+            gc.disable()
+        try:
+            if self.placed < 12:
+                # placing phase
+                r_val = self.place(turns)
+                player_functions.eliminate(
+                    self.board, self.op_piece, self.my_piece)
+                self.placed += 1
             else:
-                r_val = self.move(turns)
+                # moving phase
+                # check if can do anything
+                # FOR TESTING: Force abortion!
+                #exit()
+                m = player_functions.moves_available(
+                    self.board,self.my_piece,shrinks)
+                if m == 0:
+                    r_val = None
+                else:
+                    r_val = self.move(turns)
+        finally:
+            if gc_enabled:
+                gc.enable()
         n_shrinks = player_functions.get_shrinks(turns+1)
         if n_shrinks != shrinks:
             player_functions.shrink(self.board, n_shrinks)
         #self.print_board()
-        self.time_passed += time.time() - t_start
+        self.timer.stop()
         #print("Time (" + self.colour + "): "
-        #    + str(self.time_passed) + " seconds")
+        #    + str(self.timer.used) + " seconds")
         return r_val
 
@@ -71,7 +71,7 @@ class Player:
                 # available spot found, break loop
                 break
         # place piece
-        self.board[i_c][i_r] = self.my_piece
+        player_functions.piece_place(self.board, i_r, i_c, self.my_piece)
         return (i_c, i_r)
 
     def move(self, shrinks):
@@ -0,0 +1,173 @@
+#-------------------------------------------------------------------------------
+# Name:         async_referee.py
+# Purpose:      Plays many games of 'Watch Your Back' at once in a single
+#               process, using asyncio with players running in threads
+#               Run `python async_referee.py -h` for usage information
+#
+# Author:       Daniel Blain and Anjana Basani
+#
+# Created:      19/10/2026
+#-------------------------------------------------------------------------------
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import referee
+
+class _AsyncPlayer:
+    """
+    Wrapper for a Player class which runs its methods in an executor thread
+    Time is measured with time.thread_time() in the thread making the call, so
+    only the CPU time of this player counts, however many games overlap
+    """
+    def __init__(self, player_class, colour, time_limit, executor):
+        """
+        Prepare (but don't yet create) a player
+
+        :param player_class: the Player class (a class object) to wrap
+        :param colour: the colour of the player, either 'black' or 'white'
+        :param time_limit: limit on CPU time (seconds), 0 for unlimited
+        :param executor: the thread pool to run the player's methods in
+        """
+        self.player_class = player_class
+        self.colour = colour
+        self.limit = time_limit
+        self.executor = executor
+        self.player = None
+        self.clock = 0 # CPU time used so far (named as referee's timers)
+
+    def _timed(self, method, *args):
+        """
+        Call a method, adding the CPU time it takes to the player's total
+        Runs in an executor thread
+        """
+        t_start = time.thread_time()
+        try:
+            return method(*args)
+        finally:
+            self.clock += time.thread_time() - t_start
+
+    async def _call(self, method, *args):
+        """
+        Call a method in an executor thread, enforcing the time limit after
+        """
+        loop = asyncio.get_running_loop()
+        r_val = await loop.run_in_executor(
+            self.executor, self._timed, method, *args)
+        if self.limit and self.clock > self.limit:
+            raise referee._ResourceLimitException(
+                "Player exceeded available time")
+        return r_val
+
+    async def create(self):
+        """Create the player (this counts towards its time limit)"""
+        self.player = await self._call(self.player_class, self.colour)
+
+    async def action(self, turns):
+        return await self._call(self.player.action, turns)
+
+    async def update(self, move):
+        await self._call(self.player.update, move)
+
+async def play_async(white_class, black_class, executor, time_limit=0):
+    """
+    Play a game of Watch Your Back! between two Player classes, without
+    blocking the event loop while the players think
+
+    :param white_class: the Player class (a class object) playing White
+    :param black_class: the Player class (a class object) playing Black
+    :param executor: the thread pool to run the players' methods in
+    :param time_limit: limit on CPU time (float, seconds) for each player, 0 for
+        unlimited
+    :return: the result of the game, as for referee.play. Memory use is shared
+        by every game in the process, so space limits are not checked
+    """
+    game = referee._Game()
+    result = {'winner': None, 'reason': None, 'time': {}}
+    white = _AsyncPlayer(white_class, 'white', time_limit, executor)
+    black = _AsyncPlayer(black_class, 'black', time_limit, executor)
+    result['time'] = {'white': white, 'black': black}
+    try:
+        await white.create()
+        await black.create()
+    except referee._ResourceLimitException as e:
+        result['reason'] = f"resource limit exceeded during initialisation: {e}"
+        return referee._result(result, game)
+
+    player, opponent = white, black # white has first move
+    while game.playing():
+        try:
+            action = await player.action(game.turns)
+        except referee._ResourceLimitException as e:
+            result['reason'] = f"resource limit exceeded during action(): {e}"
+            result['loser'] = game._piece()
+            return referee._result(result, game)
+        try:
+            game.update(action)
+        except referee._InvalidActionException as e:
+            result['reason'] = f"invalid action ({game.loser}): {e}"
+            break
+        try:
+            await opponent.update(action)
+        except referee._ResourceLimitException as e:
+            result['reason'] = f"resource limit exceeded during update(): {e}"
+            result['loser'] = game._piece() # now on move
+            return referee._result(result, game)
+        # other player's turn!
+        player, opponent = opponent, player
+    return referee._result(result, game)
+
+async def play_many(pairings, threads=None, time_limit=0):
+    """
+    Play several games at once, yielding each result as its game finishes
+
+    :param pairings: a list of (White Player class, Black Player class) pairs
+    :param threads: the number of executor threads (default: one per game, so
+        a player waiting for input never holds up another game)
+    :param time_limit: limit on CPU time (float, seconds) for each player
+    :return: an asynchronous generator of (game index, result) pairs
+    """
+    if threads is None:
+        threads = max(len(pairings), 1)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        async def indexed(i, white_class, black_class):
+            return i, await play_async(
+                white_class, black_class, executor, time_limit)
+        tasks = [asyncio.create_task(indexed(i, w, b))
+            for i, (w, b) in enumerate(pairings)]
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+def main():
+    """Play games between two player modules from the command line"""
+    parser = argparse.ArgumentParser(
+        description="Plays many games of Watch Your Back! at once between "
+            "two Player classes")
+    parser.add_argument('white_module',
+        help="full name of module containing White Player class")
+    parser.add_argument('black_module',
+        help="full name of module containing Black Player class")
+    parser.add_argument('-n', '--games', type=int, default=1,
+        help="number of games to play")
+    parser.add_argument('-w', '--threads', type=int, default=None,
+        help="number of executor threads (default: one per game)")
+    parser.add_argument('-t', '--time_limit', type=float, default=0,
+        help="limit on CPU time (float, seconds) for each player")
+    args = parser.parse_args()
+
+    white = referee._load_player(args.white_module)
+    black = referee._load_player(args.black_module)
+
+    async def run():
+        async for i, r in play_many([(white, black)]*args.games,
+                args.threads, args.time_limit):
+            print(f"game {i}: winner {r['winner']} after {r['turns']} turns "
+                + f"of the {r['phase']} phase, time W {r['time']['white']:.3f}s"
+                + f" B {r['time']['black']:.3f}s"
+                + (f" ({r['reason']})" if r['reason'] else ""))
+    asyncio.run(run())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#-------------------------------------------------------------------------------
+# Name:         batch_moves.py
+# Purpose:      Finds the legal moves of many boards of 'Watch Your Back' at
+#               once, for random playouts and self-play, by treating a stack of
+#               flat boards (see flat_board.py) as one large integer with a
+#               byte for each square, and comparing shifted copies of it
+#
+# Author:       Daniel Blain and Anjana Basani
+#
+# Created:      19/10/2026
+#-------------------------------------------------------------------------------
+
+import flat_board
+from flat_board import FlatBoard, DIRECTIONS, STEPS
+
+def _table(symbols):
+    """
+    Builds a translation table which marks squares holding certain symbols
+
+    :param symbols: the symbols to mark (as ints)
+    :return: a table for bytes.translate, mapping those symbols to 1 and
+        every other symbol to 0
+    """
+    table = bytearray(256)
+    for s in symbols:
+        table[s] = 1
+    return bytes(table)
+
+MARK_EMPTY = _table([flat_board.EMPTY])
+MARK_PIECES = _table([flat_board.WHITE, flat_board.BLACK])
+MARK_PIECE = {'O': _table([flat_board.WHITE]), '@': _table([flat_board.BLACK])}
+
+def stack(boards):
+    """
+    Stacks boards into a single array, one after another
+
+    :param boards: a list of boards, either FlatBoards or list boards (as
+        used by player_functions.py)
+    :return: the squares of every board (see flat_board.SIZE), as bytes
+    """
+    l_cells = []
+    for b in boards:
+        if not isinstance(b, FlatBoard):
+            b = FlatBoard.from_lists(b)
+        l_cells.append(b.cells)
+    return b''.join(l_cells)
+
+def _lanes(cells, table):
+    """
+    Marks the squares holding certain symbols, as an integer
+
+    :param cells: stacked boards (see stack)
+    :param table: the symbols to mark (see _table)
+    :return: an integer whose i-th byte is 1 if square i holds one of the
+        symbols, 0 otherwise
+    """
+    return int.from_bytes(cells.translate(table), 'little')
+
+def _shift(lanes, step):
+    """
+    Moves each square's byte to the square a step before it, so that byte i
+    of the result describes square i+step
+
+    :param lanes: an integer of marked squares (see _lanes)
+    :param step: the offset of the square to look at (see flat_board.STEPS)
+    :return: the shifted integer
+    """
+    if step > 0:
+        return lanes >> (8*step)
+    return lanes << (-8*step)
+
+def legal_moves(cells, piece):
+    """
+    Finds the legal moves of every piece of one type, on every stacked board
+    Each board's sentinel border is never empty, so no move can cross from one
+    board into the next
+
+    :param cells: stacked boards (see stack)
+    :param piece: the piece type to find moves for (symbol)
+    :return: bytes with one byte for each square, in which bit d is set if the
+        piece there can move (or jump) in DIRECTIONS[d]
+    """
+    empty = _lanes(cells, MARK_EMPTY)
+    pieces = _lanes(cells, MARK_PIECES)
+    mine = _lanes(cells, MARK_PIECE[piece])
+    masks = 0
+    for bit, d in enumerate(DIRECTIONS):
+        s = STEPS[d]
+        # move to an empty neighbour, or jump a piece to an empty square
+        legal = _shift(empty, s) | (_shift(pieces, s) & _shift(empty, 2*s))
+        masks |= (mine & legal) << bit
+    return masks.to_bytes(len(cells), 'little')
+
+def moves_table(cells, masks, k, piece):
+    """
+    Converts the legal moves of one of the stacked boards to a move table
+
+    :param cells: stacked boards (see stack)
+    :param masks: the legal moves of the boards (see legal_moves)
+    :param k: the position of the board in the stack
+    :param piece: the piece type the moves are for (symbol)
+    :return: a dictionary mapping each piece location (column,row) to a list of
+        the directions that piece can move in, as player_functions.moves_table
+    """
+    p = ord(piece)
+    start = k * flat_board.SIZE * flat_board.SIZE
+    table = {}
+    for c in range(8):
+        base = start + flat_board.index(c, 0)
+        for r in range(8):
+            if cells[base + r] == p:
+                m = masks[base + r]
+                table[(c,r)] = [d for bit, d in enumerate(DIRECTIONS)
+                    if m & (1 << bit)]
+    return table
@@ -0,0 +1,623 @@
+#-------------------------------------------------------------------------------
+# Name:         benchmark.py
+# Purpose:      Measures the performance of player modules outside of a game
+#               Run `python benchmark.py -h` for usage information
+#
+# Author:       Daniel Blain and Anjana Basani
+#
+# Created:      19/10/2026
+#-------------------------------------------------------------------------------
+
+import argparse
+import gc
+import itertools
+import json
+import multiprocessing
+import random
+import subprocess
+import sys
+import time
+
+import player_functions
+
+PLAYER_MODULES = ['ai_player', 'ai_random_player', 'human_player']
+
+# run in a fresh interpreter, so the module hasn't been imported already
+STARTUP_SCRIPT = """
+import importlib, json, sys, time
+t_start = time.process_time()
+module = importlib.import_module(sys.argv[1])
+t_import = time.process_time() - t_start
+t_start = time.process_time()
+module.Player('white')
+t_init = time.process_time() - t_start
+print(json.dumps({'import': t_import, 'init': t_init}))
+"""
+
+def startup(modules, repeats):
+    """
+    Measures the CPU time taken to import each player module and to create a
+    Player, as the referee would (the latter counts towards the time limit)
+
+    :param modules: the names of the modules to measure
+    :param repeats: how many fresh interpreters to measure each module in
+    :return: a dictionary mapping each module name to a dictionary of the
+        mean and maximum import and initialisation times (seconds)
+    """
+    results = {}
+    for m in modules:
+        t_import = []
+        t_init = []
+        for i in range(repeats):
+            out = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, m],
+                capture_output=True, text=True, check=True)
+            times = json.loads(out.stdout.splitlines()[-1])
+            t_import.append(times['import'])
+            t_init.append(times['init'])
+        results[m] = {'import_mean': sum(t_import)/repeats,
+            'import_max': max(t_import), 'init_mean': sum(t_init)/repeats,
+            'init_max': max(t_init)}
+    return results
+
+def print_startup(results):
+    """
+    Prints the results of startup() as a table
+
+    :param results: the results to print
+    """
+    print(f"{'module':<20}{'import (mean/max)':>24}{'init (mean/max)':>24}")
+    for m, r in results.items():
+        print(f"{m:<20}"
+            + f"{r['import_mean']*1000:>13.2f}/{r['import_max']*1000:.2f}ms"
+            + f"{r['init_mean']*1000:>13.2f}/{r['init_max']*1000:.2f}ms")
+
+PRUNING_OPTIONS = {'none': [], 'null': ['null_move'],
+    'futility': ['futility'], 'lmr': ['lmr'], 'repeat': ['repetition'],
+    'all': ['null_move', 'futility', 'lmr', 'repetition']}
+
+def random_positions(count, seed=0):
+    """
+    Plays random games to find positions from the moving phase
+
+    :param count: the number of positions to find
+    :param seed: the random seed to use
+    :return: a list of (board, turns) pairs, where turns is the number of
+        turns into the moving phase (so it is White's move if turns is even)
+    """
+    rand = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = player_functions.board_init()
+        for i in range(24):
+            # white places first, in rows 0-5; black in rows 2-7
+            piece, enemy = ('O', '@') if i % 2 == 0 else ('@', 'O')
+            rows = range(0, 6) if piece == 'O' else range(2, 8)
+            places = [(c, r) for c in range(8) for r in rows
+                if board[c][r] == '-']
+            (c, r) = rand.choice(places)
+            player_functions.piece_place(board, r, c, piece)
+            player_functions.eliminate(board, enemy, piece)
+        turns = 0
+        for i in range(rand.randrange(0, 60)):
+            piece, enemy = ('O', '@') if turns % 2 == 0 else ('@', 'O')
+            table = player_functions.moves_table(board, piece, 0)
+            l_moves = [(l, d) for l in table for d in table[l]]
+            if len(l_moves) == 0:
+                break
+            ((c, r), d) = rand.choice(l_moves)
+            player_functions.move_perform(board, r, c, 0, d)
+            player_functions.eliminate(board, enemy, piece)
+            turns += 1
+        if player_functions.pieces_count(board) >= 8:
+            positions.append((board, turns))
+    return positions
+
+def pruning(module, positions, depth):
+    """
+    Measures how many nodes each of the player's forward pruning options
+    (including late move reductions and cutting off repeated positions)
+    saves, and how often using them changes the moves chosen
+
+    :param module: the name of the player module (its Player must have the
+        options and counters of ai_player.Player)
+    :param positions: a list of (board, turns) pairs to search from, as
+        returned by random_positions
+    :param depth: the depth to search each position to (iteratively, two
+        plies at a time)
+    :return: a dictionary mapping each set of options (see PRUNING_OPTIONS)
+        to a dictionary of the total 'nodes' searched, nodes 'pruned' by each
+        technique (and moves reduced, re-searched after being reduced, and
+        positions found repeated),
+        CPU 'time' (seconds) and the number of positions where the best moves
+        found were 'changed' from those found without pruning
+    """
+    import importlib
+    player_class = importlib.import_module(module).Player
+    results = {}
+    l_best = [] # best moves found without pruning
+    for name, options in PRUNING_OPTIONS.items():
+        r = {'nodes': 0, 'pruned': {'null': 0, 'futility': 0,
+            'reductions': 0, 'researches': 0, 'repeats': 0}, 'time': 0,
+            'changed': 0}
+        for i, (board, turns) in enumerate(positions):
+            player = player_class('white' if turns % 2 == 0 else 'black')
+            player.board = player_functions.board_duplicate(board)
+            for o in set().union(*PRUNING_OPTIONS.values()):
+                setattr(player, o, o in options)
+            t_start = time.process_time()
+            for d in range(2 - depth % 2, depth + 1, 2):
+                # deepen iteratively, as the player does
+                l_moves = player.move_next(player.board, True, turns,
+                    -100000, 100000, 0, d)
+            r['time'] += time.process_time() - t_start
+            l_moves = sorted(map(tuple, l_moves or []))
+            if len(options) == 0:
+                l_best.append(l_moves)
+            elif l_moves != l_best[i]:
+                r['changed'] += 1
+            r['nodes'] += player.counters['nodes']
+            for p in r['pruned']:
+                r['pruned'][p] += player.counters[p]
+        results[name] = r
+    return results
+
+def print_pruning(results, count):
+    """
+    Prints the results of pruning() as a table
+
+    :param results: the results to print
+    :param count: the number of positions searched
+    """
+    base = results['none']['nodes']
+    print(f"{'options':<12}{'nodes':>10}{'saved':>8}{'null':>8}"
+        + f"{'futility':>10}{'reduced':>9}{'again':>7}{'repeats':>9}"
+        + f"{'time':>10}{'changed':>10}")
+    for name, r in results.items():
+        p = r['pruned']
+        print(f"{name:<12}{r['nodes']:>10}{1 - r['nodes']/base:>8.1%}"
+            + f"{p['null']:>8}{p['futility']:>10}{p['reductions']:>9}"
+            + f"{p['researches']:>7}{p['repeats']:>9}{r['time']:>9.2f}s"
+            + f"{r['changed']:>5}/{count}")
+
+def movegen(positions, repeats):
+    """
+    Checks that batch_moves finds the same legal moves as ai_player's
+    move generation, including on shrunken boards, then times both
+
+    :param positions: a list of (board, turns) pairs, as returned by
+        random_positions
+    :param repeats: how many times to time finding every position's moves
+    :return: a dictionary of the CPU time (seconds) taken to find the moves of
+        both players on every board, one board at a time ('single') and all at
+        once ('batch'), and the number of boards checked
+    :raises AssertionError: if the moves found differ for any board
+    """
+    import ai_player
+    import batch_moves
+    boards = []
+    for board, turns in positions:
+        for shrinks in range(3):
+            b = player_functions.board_duplicate(board)
+            if shrinks > 0:
+                player_functions.shrink(b, shrinks)
+            boards.append((b, shrinks))
+    cells = batch_moves.stack([b for b, shrinks in boards])
+    player = ai_player.Player('white')
+    for p, my_turn in [('O', True), ('@', False)]:
+        masks = batch_moves.legal_moves(cells, p)
+        for k, (b, shrinks) in enumerate(boards):
+            table = batch_moves.moves_table(cells, masks, k, p)
+            assert table == player_functions.moves_table(b, p, shrinks), \
+                f"move table differs for board {k} ({p})"
+            if player_functions.pieces_count(b) == len(table):
+                # no enemies left, so moves_generate doesn't list any moves
+                continue
+            l_moves = player.moves_generate(b, my_turn, shrinks)
+            assert (sorted([[l[0], l[1], d] for l in table for d in table[l]])
+                == sorted(l_moves)), f"moves differ for board {k} ({p})"
+    t_start = time.process_time()
+    for i in range(repeats):
+        for b, shrinks in boards:
+            for p in ['O', '@']:
+                player_functions.moves_table(b, p, shrinks)
+    t_single = time.process_time() - t_start
+    t_start = time.process_time()
+    for i in range(repeats):
+        cells = batch_moves.stack([b for b, shrinks in boards])
+        for p in ['O', '@']:
+            masks = batch_moves.legal_moves(cells, p)
+    t_batch = time.process_time() - t_start
+    return {'single': t_single, 'batch': t_batch, 'boards': len(boards)}
+
+def doomed(count, seed=0):
+    """
+    Checks player_functions.shrink_doomed on boards with crowded outer rings,
+    for every turn before each shrink, against counting by trying every set
+    of pieces which could escape
+
+    :param count: the number of boards to check before each shrink
+    :param seed: the random seed used to fill the boards
+    :return: the number of (board, turn) pairs checked
+    :raises AssertionError: if a count differs, or falls as a shrink nears
+    """
+    rand = random.Random(seed)
+    checked = 0
+    for shrinks in range(2):
+        t_shrink = player_functions.shrink_next(64*shrinks + 64)
+        s = shrinks + 1 # shrinks after the next shrink
+        corners = [(s,s),(7-s,s),(7-s,7-s),(s,7-s)]
+        squares = [(c, r) for c in range(8) for r in range(8)
+            if shrinks <= player_functions.ring(r, c) <= s
+            and player_functions.on_board(r, c, shrinks)
+            and (c, r) not in [(shrinks,shrinks),(7-shrinks,shrinks),
+                (7-shrinks,7-shrinks),(shrinks,7-shrinks)]]
+        for i in range(count):
+            board = player_functions.board_init()
+            if shrinks > 0:
+                player_functions.shrink(board, shrinks)
+            for (c, r) in rand.sample(squares, rand.randrange(1, 13)):
+                player_functions.piece_place(board, r, c,
+                    rand.choice(['O', '@']))
+            for piece in ['O', '@']:
+                l_needed = []
+                for (c, r) in board[player_functions.PIECES][piece]:
+                    k = player_functions.ring(r, c)
+                    if k < s:
+                        l_needed.append(s - k)
+                    elif (c, r) in corners:
+                        l_needed.append(1)
+                last = 0
+                for turns in range(t_shrink - 32, t_shrink):
+                    first = turns + (turns % 2 != (piece == '@'))
+                    m_left = max(0, (t_shrink - first + 1) // 2)
+                    escape = max([len(l) for n in range(len(l_needed) + 1)
+                        for l in itertools.combinations(l_needed, n)
+                        if sum(l) <= m_left])
+                    n_doomed = player_functions.shrink_doomed(board, turns,
+                        piece)
+                    assert n_doomed == len(l_needed) - escape, \
+                        f"{n_doomed} doomed, not {len(l_needed) - escape}, " \
+                        + f"of {piece} at turn {turns} on board {i}"
+                    assert n_doomed >= last, \
+                        f"doomed {piece} fell at turn {turns} on board {i}"
+                    last = n_doomed
+                    checked += 1
+    return checked
+
+def flat(positions):
+    """
+    Checks that the functions of player_functions.py give the same results on
+    a flat_board.FlatBoard as on the list board it was made from, including
+    on shrunken boards and after moving pieces
+
+    :param positions: a list of (board, turns) pairs, as returned by
+        random_positions
+    :return: the number of boards checked
+    :raises AssertionError: if any result differs
+    """
+    from flat_board import FlatBoard
+    pf = player_functions # short-hand
+    checked = 0
+    for k, (board, turns) in enumerate(positions):
+        for shrinks in range(3):
+            b = pf.board_duplicate(board)
+            if shrinks > 0:
+                pf.shrink(b, shrinks)
+            f = FlatBoard.from_lists(b)
+            assert pf.board_duplicate(f) == b, f"board_duplicate, board {k}"
+            assert f.to_lists() == b[:8], f"to_lists, board {k}"
+            for name in ['board_key', 'pieces_count', 'enemy_distances']:
+                assert getattr(pf, name)(f) == getattr(pf, name)(b), \
+                    f"{name}, board {k}"
+            assert pf.threat_map(f, shrinks) == pf.threat_map(b, shrinks), \
+                f"threat_map, board {k}"
+            for p in ['O', '@']:
+                for name in ['moves_available', 'moves_table']:
+                    assert (getattr(pf, name)(f, p, shrinks)
+                        == getattr(pf, name)(b, p, shrinks)), \
+                        f"{name}, board {k} ({p})"
+                assert (pf.shrink_doomed(f, 64*shrinks + turns, p)
+                    == pf.shrink_doomed(b, 64*shrinks + turns, p)), \
+                    f"shrink_doomed, board {k} ({p})"
+            for c in range(8):
+                for r in range(8):
+                    for name in ['surrounded', 'can_surround', 'dist_enemy']:
+                        assert (getattr(pf, name)(f, r, c)
+                            == getattr(pf, name)(b, r, c)), \
+                            f"{name} of {(c, r)}, board {k}"
+                    for p in ['O', '@']:
+                        for name in ['piece_adjacent', 'piece_jumpto']:
+                            assert (getattr(pf, name)(f, r, c, p)
+                                == getattr(pf, name)(b, r, c, p)), \
+                                f"{name} of {(c, r)}, board {k} ({p})"
+            # move each piece, in each direction it can, on copies of both
+            for p, e in [('O', '@'), ('@', 'O')]:
+                table = pf.moves_table(b, p, shrinks)
+                for (c, r) in table:
+                    for d in table[(c, r)]:
+                        n_b = pf.board_duplicate(b)
+                        n_f = f.copy()
+                        assert (pf.move_perform(n_f, r, c, shrinks, d)
+                            == pf.move_perform(n_b, r, c, shrinks, d)), \
+                            f"move_perform of {(c, r)} {d}, board {k}"
+                        pf.eliminate(n_b, e, p)
+                        pf.eliminate(n_f, e, p)
+                        assert n_f.to_lists() == n_b[:8], \
+                            f"eliminate after {(c, r)} {d}, board {k}"
+            if shrinks < 2:
+                n_f = f.copy()
+                pf.shrink(n_f, shrinks + 1)
+                pf.shrink(b, shrinks + 1)
+                assert n_f.to_lists() == b[:8], f"shrink, board {k}"
+            checked += 1
+    return checked
+
+def _search_worker(module, table, board, turns, depth, seed, results):
+    """
+    Search a position in a worker process, as one of a parallel search
+
+    :param module: the name of the player module (see pruning)
+    :param table: the name of the shared transposition table to use, or None
+        for the player's own
+    :param board: the board to search
+    :param turns: the number of turns into the moving phase
+    :param depth: the depth to search to (iteratively, as pruning does)
+    :param seed: a random seed used to shuffle the order quiet moves are
+        searched in, so that workers search different parts of the tree
+        first (0 to keep the player's order)
+    :param results: the queue to put the moves found, the nodes searched and
+        the time taken (seconds) on
+    """
+    import importlib
+    import shared_cache
+    player = importlib.import_module(module).Player(
+        'white' if turns % 2 == 0 else 'black')
+    player.board = board
+    if table is not None:
+        player.t_table = shared_cache.SharedTranspositionTable(0, table)
+    if seed != 0:
+        rand = random.Random(seed)
+        for my_turn in [True, False]:
+            for c in range(8):
+                for r in range(8):
+                    for d in ['left', 'right', 'up', 'down']:
+                        player.history[(my_turn, c, r, d)] = rand.random()
+    t_start = time.perf_counter()
+    for d in range(2 - depth % 2, depth + 1, 2):
+        l_moves = player.move_next(player.board, True, turns,
+            -100000, 100000, 0, d)
+    t_search = time.perf_counter() - t_start
+    results.put((sorted(map(tuple, l_moves or [])), player.counters['nodes'],
+        t_search))
+    if table is not None:
+        player.t_table.close()
+
+def shared(module, positions, depth, workers, size_mb):
+    """
+    Compares searching with several worker processes, each with its own
+    transposition table or all sharing one (see
+    shared_cache.SharedTranspositionTable), against a single search
+    As in a parallel search, each position's result is that of the first
+    worker to finish
+
+    :param module: the name of the player module (see pruning)
+    :param positions: a list of (board, turns) pairs to search from, as
+        returned by random_positions
+    :param depth: the depth to search each position to
+    :param workers: the number of worker processes
+    :param size_mb: the size of the shared table (MB)
+    :return: a dictionary mapping 'single', 'private' and 'shared' to a
+        dictionary of the total 'nodes' searched by every worker, the
+        real 'time' (seconds) until the first worker finished and the number
+        of positions where the best moves found were 'changed' from those
+        found by a single search
+    """
+    import shared_cache
+    results = {}
+    l_best = [] # best moves found by a single search
+    for name, count in [('single', 1), ('private', workers),
+            ('shared', workers)]:
+        r = {'nodes': 0, 'time': 0, 'changed': 0}
+        for i, (board, turns) in enumerate(positions):
+            table = None
+            if name == 'shared':
+                table = shared_cache.SharedTranspositionTable(size_mb)
+            queue = multiprocessing.Queue()
+            l_workers = [multiprocessing.Process(target=_search_worker,
+                    args=(module, table and table.name, board, turns, depth,
+                        k, queue))
+                for k in range(count)]
+            for w in l_workers:
+                w.start()
+            l_results = [queue.get() for w in l_workers]
+            for w in l_workers:
+                w.join()
+            if table is not None:
+                table.close()
+                table.unlink()
+            l_moves, nodes, t_search = min(l_results, key=lambda x: x[2])
+            r['time'] += t_search
+            r['nodes'] += sum(x[1] for x in l_results)
+            if name == 'single':
+                l_best.append(l_moves)
+            elif l_moves != l_best[i]:
+                r['changed'] += 1
+        results[name] = r
+    return results
+
+def print_shared(results, count):
+    """
+    Prints the results of shared() as a table
+
+    :param results: the results to print
+    :param count: the number of positions searched
+    """
+    base = results['single']['time']
+    print(f"{'tables':<12}{'nodes':>10}{'time':>10}{'speedup':>9}"
+        + f"{'changed':>10}")
+    for name, r in results.items():
+        print(f"{name:<12}{r['nodes']:>10}{r['time']:>9.2f}s"
+            + f"{base/r['time']:>8.2f}x{r['changed']:>5}/{count}")
+
+def gc_pauses(module, games, seed=0):
+    """
+    Measures how long garbage collection pauses the player during its turns,
+    playing games against ai_random_player with the player holding off
+    collection while it searches (see ai_player.Player.gc_control) and not
+
+    :param module: the name of the player module (its Player must have the
+        gc_control option of ai_player.Player)
+    :param games: the number of games to play with each setting
+    :param seed: the random seed of the first game (see referee.play)
+    :return: a dictionary mapping 'on' and 'off' to a dictionary of the
+        number of 'moves' made, their total CPU 'time' and the 'slowest' one
+        (seconds), and the number of 'collections' made during the player's
+        turns, their total real time ('paused') and the longest one ('pause')
+    """
+    import importlib
+    import referee
+    player_class = importlib.import_module(module).Player
+    opponent = referee._load_player('ai_random_player')
+    state = {'acting': False, 'start': 0} # whether in the player's turn
+    pauses = []
+    def on_gc(phase, info):
+        # time collections made while the player is taking its turn (the
+        # referee's own collections happen between turns)
+        if not state['acting']:
+            return
+        if phase == 'start':
+            state['start'] = time.perf_counter()
+        else:
+            pauses.append(time.perf_counter() - state['start'])
+    results = {}
+    gc.callbacks.append(on_gc)
+    try:
+        for name, control in [('off', False), ('on', True)]:
+            pauses.clear()
+            t_moves = []
+            class TimedPlayer(player_class):
+                def action(self, turns):
+                    self.gc_control = control
+                    state['acting'] = True
+                    t_start = time.process_time()
+                    try:
+                        return super().action(turns)
+                    finally:
+                        state['acting'] = False
+                        t_moves.append(time.process_time() - t_start)
+            for i in range(games):
+                referee.play(TimedPlayer, opponent, verbose=False,
+                    seed=seed + i)
+            results[name] = {'moves': len(t_moves), 'time': sum(t_moves),
+                'slowest': max(t_moves), 'collections': len(pauses),
+                'paused': sum(pauses), 'pause': max(pauses, default=0)}
+    finally:
+        gc.callbacks.remove(on_gc)
+    return results
+
+def print_gc(results):
+    """
+    Prints the results of gc_pauses() as a table
+
+    :param results: the results to print
+    """
+    print(f"{'gc control':<12}{'moves':>7}{'time':>10}{'slowest':>10}"
+        + f"{'collections':>13}{'paused':>10}{'longest':>10}")
+    for name, r in results.items():
+        print(f"{name:<12}{r['moves']:>7}{r['time']:>9.2f}s"
+            + f"{r['slowest']:>9.3f}s{r['collections']:>13}"
+            + f"{r['paused']*1000:>8.1f}ms{r['pause']*1000:>8.2f}ms")
+
+def main():
+    """Run the benchmark chosen on the command line"""
+    parser = argparse.ArgumentParser(
+        description="Measures the performance of player modules")
+    commands = parser.add_subparsers(dest='command', required=True)
+    p_startup = commands.add_parser('startup',
+        help="time importing each module and creating its Player")
+    p_startup.add_argument('modules', nargs='*', default=PLAYER_MODULES,
+        help="names of the player modules to measure")
+    p_startup.add_argument('-r', '--repeats', type=int, default=10,
+        help="how many fresh interpreters to measure each module in")
+    p_pruning = commands.add_parser('pruning',
+        help="compare the AI player's forward pruning options")
+    p_pruning.add_argument('module', nargs='?', default='ai_player',
+        help="name of the player module to measure")
+    p_pruning.add_argument('-n', '--positions', type=int, default=5,
+        help="number of random positions to search")
+    p_pruning.add_argument('-d', '--depth', type=int, default=6,
+        help="depth to search each position to")
+    p_pruning.add_argument('--seed', type=int, default=0,
+        help="random seed used to find the positions")
+    p_movegen = commands.add_parser('movegen',
+        help="check and time finding legal moves for batches of boards")
+    p_movegen.add_argument('-n', '--positions', type=int, default=100,
+        help="number of random positions (each also checked shrunk)")
+    p_movegen.add_argument('-r', '--repeats', type=int, default=10,
+        help="how many times to time finding every position's moves")
+    p_movegen.add_argument('--seed', type=int, default=0,
+        help="random seed used to find the positions")
+    p_shared = commands.add_parser('shared',
+        help="compare parallel searches with private and shared tables")
+    p_shared.add_argument('module', nargs='?', default='ai_player',
+        help="name of the player module to measure")
+    p_shared.add_argument('-w', '--workers', type=int,
+        default=multiprocessing.cpu_count(),
+        help="number of worker processes (default: one per CPU)")
+    p_shared.add_argument('-m', '--megabytes', type=float, default=16,
+        help="size of the shared transposition table (MB)")
+    p_shared.add_argument('-n', '--positions', type=int, default=5,
+        help="number of random positions to search")
+    p_shared.add_argument('-d', '--depth', type=int, default=6,
+        help="depth to search each position to")
+    p_shared.add_argument('--seed', type=int, default=0,
+        help="random seed used to find the positions")
+    p_gc = commands.add_parser('gc',
+        help="measure garbage collection pauses during the AI player's turns")
+    p_gc.add_argument('module', nargs='?', default='ai_player',
+        help="name of the player module to measure")
+    p_gc.add_argument('-g', '--games', type=int, default=2,
+        help="number of games against the random player for each setting")
+    p_gc.add_argument('--seed', type=int, default=0,
+        help="random seed of the first game")
+    p_flat = commands.add_parser('flat',
+        help="check player_functions gives the same results on flat boards")
+    p_flat.add_argument('-n', '--positions', type=int, default=50,
+        help="number of random positions (each also checked shrunk)")
+    p_flat.add_argument('--seed', type=int, default=0,
+        help="random seed used to find the positions")
+    p_doomed = commands.add_parser('doomed',
+        help="check counting the pieces each shrink will remove")
+    p_doomed.add_argument('-n', '--boards', type=int, default=50,
+        help="number of boards to check before each shrink")
+    p_doomed.add_argument('--seed', type=int, default=0,
+        help="random seed used to fill the boards")
+    args = parser.parse_args()
+
+    if args.command == 'startup':
+        print_startup(startup(args.modules, args.repeats))
+    elif args.command == 'pruning':
+        positions = random_positions(args.positions, args.seed)
+        print_pruning(pruning(args.module, positions, args.depth),
+            args.positions)
+    elif args.command == 'movegen':
+        r = movegen(random_positions(args.positions, args.seed),
+            args.repeats)
+        print(f"moves match for {r['boards']} boards")
+        print(f"one at a time: {r['single']*1000:.2f}ms, "
+            + f"batched: {r['batch']*1000:.2f}ms")
+    elif args.command == 'flat':
+        r = flat(random_positions(args.positions, args.seed))
+        print(f"player_functions agrees on {r} flat boards")
+    elif args.command == 'doomed':
+        print(f"doomed pieces match for "
+            + f"{doomed(args.boards, args.seed)} turns")
+    elif args.command == 'gc':
+        print_gc(gc_pauses(args.module, args.games, args.seed))
+    elif args.command == 'shared':
+        positions = random_positions(args.positions, args.seed)
+        print_shared(shared(args.module, positions, args.depth, args.workers,
+            args.megabytes), args.positions)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+#-------------------------------------------------------------------------------
+# Name:         flat_board.py
+# Purpose:      A compact board for 'Watch Your Back', stored as a single
+#               bytearray with a border of sentinel squares, so that moves and
+#               jumps can be checked without testing the bounds of the board
+#               Boards can also be indexed as board[column][row], like the
+#               boards used by player_functions.py
+#
+# Author:       Daniel Blain and Anjana Basani
+#
+# Created:      19/10/2026
+#-------------------------------------------------------------------------------
+
+from player_functions import PIECES
+
+BORDER = 2 # sentinel squares beyond each edge, enough for a jump
+SIZE = 8 + 2*BORDER # squares along each side of the array
+
+EMPTY = ord('-')
+WHITE = ord('O')
+BLACK = ord('@')
+CORNER = ord('X')
+REMOVED = ord(' ') # squares removed by a shrink, as in player_functions.shrink
+SENTINEL = ord('#') # squares beyond the edge of the board
+
+# offset of the neighbouring square in each direction (column-major, as the
+# referee's (x, y) actions and player_functions' board[column][row])
+STEPS = {'left': -SIZE, 'right': SIZE, 'up': -1, 'down': 1}
+DIRECTIONS = ['left', 'right', 'up', 'down']
+
+def index(col, row):
+    """
+    Returns the position of a square in a board's array
+
+    :param col: the column of the square
+    :param row: the row of the square
+    :return: the index of the square
+    """
+    return (col+BORDER)*SIZE + row + BORDER
+
+def location(i):
+    """
+    Returns the square at a position in a board's array
+
+    :param i: the index of the square
+    :return: the location of the square, as (column,row)
+    """
+    return (i//SIZE - BORDER, i%SIZE - BORDER)
+
+# squares of the board, in the order player_functions.eliminate checks them
+SQUARES = [index(c, r) for r in range(8) for c in range(8)]
+
+class _Column:
+    """
+    View of one column of a FlatBoard, so that board[column][row] reads and
+    writes symbols as it does for a list board
+    """
+    __slots__ = ('cells', 'base')
+
+    def __init__(self, cells, col):
+        self.cells = cells
+        self.base = index(col, 0)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            # a list of symbols, as slicing a list board's column gives
+            return [chr(p) for p in self.cells[self.base:self.base + 8][row]]
+        if not 0 <= row < 8:
+            raise IndexError("row out of range")
+        return chr(self.cells[self.base + row])
+
+    def __setitem__(self, row, symbol):
+        if not 0 <= row < 8:
+            raise IndexError("row out of range")
+        self.cells[self.base + row] = ord(symbol)
+
+    def __len__(self):
+        return 8
+
+    def __iter__(self):
+        for i in range(self.base, self.base + 8):
+            yield chr(self.cells[i])
+
+class FlatBoard:
+    """
+    Class for a board stored as a bytearray of SIZE*SIZE squares, column by
+    column, with the 8x8 board surrounded by SENTINEL squares
+    Indexing (board[column][row]) gives the same symbols as a list board, so
+    the functions of player_functions.py also work on a FlatBoard
+    """
+    __slots__ = ('cells',)
+
+    def __init__(self, cells=None):
+        """
+        Initialise a board
+
+        :param cells: the array of squares to use (default: an empty board,
+            as player_functions.board_init)
+        """
+        if cells is None:
+            cells = bytearray([SENTINEL]) * (SIZE*SIZE)
+            for i in SQUARES:
+                cells[i] = EMPTY
+            for (c, r) in [(0,0), (0,7), (7,0), (7,7)]:
+                cells[index(c, r)] = CORNER
+        self.cells = cells
+
+    @classmethod
+    def from_lists(cls, board):
+        """
+        Creates a FlatBoard from a list board
+
+        :param board: the board to copy (board[column][row])
+        :return: the new FlatBoard
+        """
+        b = cls()
+        for c in range(8):
+            base = index(c, 0)
+            for r in range(8):
+                b.cells[base + r] = ord(board[c][r])
+        return b
+
+    def to_lists(self):
+        """
+        Creates a list board from this board
+
+        :return: a 2D array (board[column][row]) of the board's symbols
+        """
+        return [list(col) for col in self]
+
+    def copy(self):
+        """
+        Returns a duplicate of the board (a single copy of its array)
+
+        :return: the new FlatBoard
+        """
+        return FlatBoard(self.cells[:])
+
+    def key(self):
+        """
+        Returns a hashable representation of the board
+
+        :return: the board's array, as bytes
+        """
+        return bytes(self.cells)
+
+    @property
+    def pieces(self):
+        """
+        The locations of each player's pieces, found by scanning the board
+        (list boards keep these sets up to date instead)
+        """
+        pieces = {'O': set(), '@': set()}
+        for i in SQUARES:
+            if self.cells[i] == WHITE:
+                pieces['O'].add(location(i))
+            elif self.cells[i] == BLACK:
+                pieces['@'].add(location(i))
+        return pieces
+
+    def __getitem__(self, col):
+        if col == PIECES:
+            # as player_functions expects of a list board
+            return self.pieces
+        if not 0 <= col < 8:
+            raise IndexError("column out of range")
+        return _Column(self.cells, col)
+
+    def __len__(self):
+        return 8
+
+    def __iter__(self):
+        for c in range(8):
+            yield _Column(self.cells, c)
+
+def piece_moves(board, row, col, shrinks=None):
+    """
+    Lists the directions an indicated piece can move or jump in
+    Squares removed by shrinking are never empty, so shrinks isn't needed; it
+    is accepted to match player_functions.piece_moves
+
+    :param board: the board state to check (a FlatBoard)
+    :param row: the row of the piece
+    :param col: the column of the piece
+    :param shrinks: the number of times the board has shrunk (unused)
+    :return: a list of the directions the piece can move in
+    """
+    cells = board.cells
+    i = index(col, row)
+    l_dirs = []
+    for d in DIRECTIONS:
+        s = STEPS[d]
+        n = cells[i+s]
+        if n == EMPTY:
+            l_dirs.append(d)
+        elif (n == WHITE or n == BLACK) and cells[i+2*s] == EMPTY:
+            l_dirs.append(d)
+    return l_dirs
+
+def moves_table(board, my_p, shrinks=None):
+    """
+    Builds a table of the legal moves of each piece of the indicated type
+
+    :param board: the board state to check (a FlatBoard)
+    :param my_p: the piece type to check for (symbol)
+    :param shrinks: the number of times the board has shrunk (unused)
+    :return: a dictionary mapping each piece location (column,row) to a list of
+        the directions that piece can move in, as player_functions.moves_table
+    """
+    cells = board.cells
+    p = ord(my_p)
+    table = {}
+    for c in range(8):
+        base = index(c, 0)
+        for r in range(8):
+            if cells[base + r] == p:
+                table[(c,r)] = piece_moves(board, r, c)
+    return table
+
+def move_perform(board, row, col, shrinks, direction):
+    """
+    Moves or jumps a piece in the indicated direction
+    Assumes the piece can move (or jump) in this direction
+
+    :param board: the board to update (a FlatBoard)
+    :param row: the row of the piece
+    :param col: the column of the piece
+    :param shrinks: the number of times the board has shrunk (unused)
+    :param direction: the direction to move the piece in
+    :return: the new location, as a tuple
+    """
+    cells = board.cells
+    i = index(col, row)
+    s = STEPS[direction]
+    n = i + s
+    if cells[n] != EMPTY:
+        # jump over the piece in the way
+        n += s
+    cells[n] = cells[i]
+    cells[i] = EMPTY
+    return location(n)
+
+def surrounded(board, i):
+    """
+    Checks if the piece at a square is surrounded
+
+    :param board: the board to check (a FlatBoard)
+    :param i: the index of the square
+    :return: True if the piece is surrounded, False otherwise
+    """
+    cells = board.cells
+    p = cells[i]
+    if p == WHITE:
+        e = BLACK
+    elif p == BLACK:
+        e = WHITE
+    else:
+        # not a piece
+        return False
+    for s in (1, SIZE):
+        a = cells[i-s]
+        b = cells[i+s]
+        if (a == e or a == CORNER) and (b == e or b == CORNER):
+            # surrounded by enemies!
+            return True
+    return False
+
+def eliminate(board, e_first, e_second, removed=None):
+    """
+    Updates the given board so that pieces are eliminated correctly
+
+    :param board: the current board state (a FlatBoard)
+    :param e_first: the first kind of piece to eliminate
+    :param e_second: the second kind of piece to eliminate
+    :param removed: a list to add the (column,row) locations of eliminated
+        pieces to (optional)
+    :return: the updated board state
+    """
+    cells = board.cells
+    for p in (ord(e_first), ord(e_second)):
+        for i in SQUARES:
+            if cells[i] == p and surrounded(board, i):
+                cells[i] = EMPTY
+                if removed is not None:
+                    removed.append(location(i))
+    return board
+
+def shrink(board, shrinks):
+    """
+    Shrink the input game board
+
+    :param board: the board to shrink (a FlatBoard)
+    :param shrinks: the number of times to shrink
+    :return: the shrunken board
+    """
+    s = shrinks # short-hand
+    cells = board.cells
+    for i in SQUARES:
+        (c, r) = location(i)
+        if r < s or c < s or r > 7-s or c > 7-s:
+            cells[i] = REMOVED
+    for (c, r) in [(s,s), (s,7-s), (7-s,7-s), (7-s,s)]:
+        # place new corners, then remove pieces they surround
+        n = index(c, r)
+        cells[n] = CORNER
+        for d in (-1, 1, SIZE, -SIZE):
+            if surrounded(board, n+d):
+                cells[n+d] = EMPTY
+    return board
+
+def update(board, action, p_my, p_op):
+    """
+    Update the player's board based on the opponent's action
+    Actions use the referee's convention: (x, y) for a place, or
+    ((x, y), (x, y)) for a move, where x is the column and y the row
+
+    :param board: the player's current board state (a FlatBoard)
+    :param action: the opponent's last action
+    :param p_my: the character representing a piece of this player
+    :param p_op: the character representing an opponent's piece
+    :return: the updated board state
+    """
+    cells = board.cells
+    if action is None:
+        # no action was taken previously
+        return board
+    elif type(action[0]) == int:
+        # a tuple of ints, so a piece was placed
+        (x, y) = action
+        cells[index(x, y)] = ord(p_op)
+    else:
+        # a tuple of tuples, so a piece was moved
+        ((xa, ya), (xb, yb)) = action
+        cells[index(xa, ya)] = EMPTY
+        cells[index(xb, yb)] = ord(p_op)
+    eliminate(board, p_my, p_op)
+    return board
@@ -92,7 +92,7 @@ class Player:
             print("Non-empty space!")
             return None
         # all checks passed, place piece
-        self.board[i_c][i_r] = self.my_piece
+        player_functions.piece_place(self.board, i_r, i_c, self.my_piece)
         return (i_c, i_r)
 
     def move(self, shrinks):
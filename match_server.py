@@ -0,0 +1,358 @@
+#-------------------------------------------------------------------------------
+# Name:         match_server.py
+# Purpose:      A long-lived server which plays games of 'Watch Your Back'
+#               between player modules, using a pool of worker processes which
+#               keep the modules imported between games
+#               Run `python match_server.py -h` for usage information
+#
+# Author:       Daniel Blain and Anjana Basani
+#
+# Created:      19/10/2026
+#-------------------------------------------------------------------------------
+
+import argparse
+import ast
+import itertools
+import multiprocessing
+import os
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+import referee
+
+SERVER_PORT = 6030 # default port for the server to listen on (localhost only)
+KEY_FILE = os.path.join(os.path.expanduser('~'), '.match_server_key')
+# file a running server keeps its (random) key in, readable only by its user
+KEY_BYTES = 32 # length of each server's key
+PRELOAD_MODULES = ['ai_player', 'ai_random_player']
+
+def key_new(path=KEY_FILE):
+    """
+    Make a random key for a server, saving it where only this user can read it
+    Clients must know the key to send jobs, as the server unpickles them and
+    imports whichever modules they name
+
+    :param path: the file to save the key in (replacing any old key)
+    :return: the key, as bytes
+    """
+    key = os.urandom(KEY_BYTES)
+    if os.path.exists(path):
+        os.remove(path) # so the new file gets the permissions below
+    with open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600),
+            'wb') as key_file:
+        key_file.write(key)
+    return key
+
+def key_read(path=KEY_FILE):
+    """
+    Read the key saved by a running server
+
+    :param path: the file the key was saved in
+    :return: the key, as bytes
+    """
+    with open(path, 'rb') as key_file:
+        return key_file.read()
+
+def _job_valid(job):
+    """
+    Checks that a job sent by a client can be queued
+
+    :param job: the job (see request)
+    :return: True if the job is a dictionary of the right entries, False
+        otherwise
+    """
+    if not isinstance(job, dict):
+        return False
+    if not isinstance(job.get('white'), str):
+        return False
+    if not isinstance(job.get('black'), str):
+        return False
+    if not isinstance(job.get('seed'), (int, type(None))):
+        return False
+    for limit in ['time', 'space']:
+        if not isinstance(job.get(limit, 0), (int, float)):
+            return False
+    return True
+
+def load_player(spec):
+    """
+    Load a Player class given the name of a module, optionally followed by
+    options to set on each Player once it is made, e.g.
+    'ai_player:lmr=False,null_move=True'
+
+    :param spec: the module name and options
+    :return: the Player class (a class object), or a subclass of it which sets
+        the options
+    :raises ValueError: if the module's players have no attribute of the
+        same name as an option (so a misspelt option isn't ignored)
+    """
+    module, _, options = spec.partition(':')
+    player_class = referee._load_player(module)
+    if options == '':
+        return player_class
+    attrs = {}
+    for option in options.split(','):
+        name, _, value = option.partition('=')
+        try:
+            attrs[name.strip()] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            # not a Python literal, so take it as a string
+            attrs[name.strip()] = value.strip()
+    player = player_class('white')
+    for name in attrs:
+        if not hasattr(player, name):
+            raise ValueError(f"{module} players have no option '{name}'")
+
+    class ConfiguredPlayer(player_class):
+        def __init__(self, colour):
+            super().__init__(colour)
+            for name, value in attrs.items():
+                setattr(self, name, value)
+    ConfiguredPlayer.__name__ = player_class.__name__
+    return ConfiguredPlayer
+
+def _worker(preload, jobs, results):
+    """
+    Play games for the server until told to stop (by a None job)
+    Player modules are imported once and kept for every later game, so any
+    tables they build are also reused
+
+    :param preload: the names of the player modules to import straight away
+    :param jobs: the queue to take jobs from (see MatchServer.submit)
+    :param results: the queue to put results on
+    """
+    players = {} # Player classes, by module name (and options)
+    for m in preload:
+        players[m] = load_player(m)
+    while True:
+        job = jobs.get()
+        if job is None:
+            # server shutting down
+            break
+        result = {'id': job['id'], 'white': job['white'],
+            'black': job['black'], 'seed': job.get('seed'), 'winner': None,
+            'reason': None, 'phase': None, 'turns': 0, 'time': {}}
+        try:
+            for m in [job['white'], job['black']]:
+                if m not in players:
+                    players[m] = load_player(m)
+            # the referee's timers measure this process' CPU time, which only
+            # this game is using. This process' peak memory includes every
+            # game it has played, so a game with a space limit runs each
+            # player in a fresh process of its own, to be measured apart
+            result.update(referee.play(players[job['white']],
+                players[job['black']], job.get('time', 0),
+                job.get('space', 0), verbose=False, seed=job.get('seed'),
+                isolate=job.get('space', 0) > 0))
+        except Exception as e:
+            # a broken player shouldn't bring down the worker
+            result['reason'] = f"{type(e).__name__}: {e}"
+        results.put(result)
+
+class MatchServer:
+    """Class for a pool of workers which play games between player modules"""
+    def __init__(self, workers=None, preload=PRELOAD_MODULES):
+        """
+        Start the worker processes
+
+        :param workers: the number of worker processes (default: one per CPU)
+        :param preload: the names of the player modules each worker imports
+            before taking any jobs
+        """
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        self.jobs = multiprocessing.Queue()
+        self.results = multiprocessing.Queue()
+        self.ids = itertools.count()
+        # not daemons, as they may start processes for players (see _worker)
+        self.workers = [multiprocessing.Process(target=_worker,
+                args=(preload, self.jobs, self.results))
+            for i in range(workers)]
+        for w in self.workers:
+            w.start()
+
+    def submit(self, white, black, seed=None, time_limit=0, space_limit=0):
+        """
+        Queue a game to be played by the next free worker
+
+        :param white: the name of the module containing White's Player class,
+            and any options to set (see load_player)
+        :param black: the name of the module containing Black's Player class,
+            and any options to set
+        :param seed: the random seed for the game (see referee.play)
+        :param time_limit: limit on CPU time (seconds) for each player
+        :param space_limit: limit on memory space (MB) for each player; if
+            set, each player runs in its own process (see referee.play), so
+            that only this game's memory is counted
+        :return: the id of the job, which its result will include
+        """
+        job_id = next(self.ids)
+        self.jobs.put({'id': job_id, 'white': white, 'black': black,
+            'seed': seed, 'time': time_limit, 'space': space_limit})
+        return job_id
+
+    def result(self):
+        """
+        Wait for the next game to finish
+
+        :return: the result of the game (see referee.play), along with the
+            job's 'id', 'white', 'black' and 'seed'
+        """
+        return self.results.get()
+
+    def close(self):
+        """
+        Stop the workers once they have finished the jobs already queued
+        """
+        for w in self.workers:
+            self.jobs.put(None)
+        for w in self.workers:
+            w.join()
+
+    def serve(self, port=SERVER_PORT, authkey=None):
+        """
+        Accept jobs from clients (see request) until interrupted
+        Each client sends a list of jobs, and is sent each result as soon as
+        its game finishes, followed by None once all of them are done
+        (a client whose jobs aren't all valid is only sent None). Clients
+        are read from in threads of their own, and one which fails to
+        connect or goes away doesn't stop the server
+
+        :param port: the port to listen on (localhost only)
+        :param authkey: the key clients must use to connect (default: a new
+            random key, saved to KEY_FILE for clients to read)
+        """
+        if authkey is None:
+            authkey = key_new()
+        clients = {} # client connections and jobs left, by job id
+        lock = threading.Lock()
+
+        def forward():
+            # send results back to whichever client asked for them
+            while True:
+                result = self.result()
+                with lock:
+                    conn, left = clients.pop(result['id'])
+                    left[0] -= 1
+                try:
+                    conn.send(result)
+                    if left[0] == 0:
+                        conn.send(None)
+                        conn.close()
+                except OSError:
+                    pass # client has gone away
+        threading.Thread(target=forward, daemon=True).start()
+
+        def receive(conn):
+            # take a client's jobs, without holding up other clients
+            try:
+                jobs = conn.recv()
+            except (EOFError, OSError):
+                # client has gone away
+                conn.close()
+                return
+            if (not isinstance(jobs, list) or len(jobs) == 0
+                    or not all([_job_valid(job) for job in jobs])):
+                # nothing to play (or jobs which can't be played)
+                try:
+                    conn.send(None)
+                except OSError:
+                    pass
+                conn.close()
+                return
+            left = [len(jobs)]
+            with lock:
+                for job in jobs:
+                    job_id = self.submit(job['white'], job['black'],
+                        job.get('seed'), job.get('time', 0),
+                        job.get('space', 0))
+                    clients[job_id] = (conn, left)
+
+        with Listener(('localhost', port), authkey=authkey) as listener:
+            while True:
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, EOFError, OSError):
+                    # wrong key, or the client went away while connecting
+                    continue
+                threading.Thread(target=receive, args=(conn,),
+                    daemon=True).start()
+
+def request(jobs, port=SERVER_PORT, authkey=None):
+    """
+    Send jobs to a running server, and wait for their results
+
+    :param jobs: a list of jobs, each a dictionary with entries 'white' and
+        'black' (module names), and optionally 'seed', 'time' and 'space'
+    :param port: the port the server listens on
+    :param authkey: the server's key (default: the key in KEY_FILE)
+    :return: a generator of results, in the order the games finish
+    """
+    if authkey is None:
+        authkey = key_read()
+    with Client(('localhost', port), authkey=authkey) as conn:
+        conn.send(jobs)
+        while True:
+            result = conn.recv()
+            if result is None:
+                break
+            yield result
+
+def main():
+    """Run the server, or send it games to play, from the command line"""
+    parser = argparse.ArgumentParser(
+        description="Plays games of Watch Your Back! using a pool of workers")
+    parser.add_argument('-p', '--port', type=int, default=SERVER_PORT,
+        help="port the server listens on (localhost only)")
+    parser.add_argument('-k', '--key_file', default=KEY_FILE,
+        help="file the server saves its random key in, for clients to read")
+    commands = parser.add_subparsers(dest='command', required=True)
+    p_serve = commands.add_parser('serve', help="start the server")
+    p_serve.add_argument('-w', '--workers', type=int, default=None,
+        help="number of worker processes (default: one per CPU)")
+    p_serve.add_argument('--preload', nargs='*', default=PRELOAD_MODULES,
+        help="player modules for workers to import on start-up")
+    p_play = commands.add_parser('play', help="send games to the server")
+    p_play.add_argument('white_module',
+        help="full name of module containing White Player class (and any "
+            "options, e.g. ai_player:lmr=False)")
+    p_play.add_argument('black_module',
+        help="full name of module containing Black Player class (and any "
+            "options)")
+    p_play.add_argument('-n', '--games', type=int, default=1,
+        help="number of games to play")
+    p_play.add_argument('--seed', type=int, default=None,
+        help="random seed of the first game (later games count up from it)")
+    p_play.add_argument('-s', '--space_limit', type=float, default=0,
+        help="limit on memory space (float, MB) for each player")
+    p_play.add_argument('-t', '--time_limit', type=float, default=0,
+        help="limit on CPU time (float, seconds) for each player")
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        server = MatchServer(args.workers, args.preload)
+        print(f"serving on localhost:{args.port} with "
+            + f"{len(server.workers)} workers")
+        try:
+            server.serve(args.port, key_new(args.key_file))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+    else:
+        jobs = []
+        for i in range(args.games):
+            seed = None if args.seed is None else args.seed + i
+            jobs.append({'white': args.white_module,
+                'black': args.black_module, 'seed': seed,
+                'time': args.time_limit, 'space': args.space_limit})
+        for r in request(jobs, args.port, key_read(args.key_file)):
+            print(f"game {r['id']} (seed {r['seed']}): winner {r['winner']} "
+                + f"after {r['turns']} turns of the {r['phase']} phase, "
+                + f"time W {r['time'].get('white', 0):.3f}s "
+                + f"B {r['time'].get('black', 0):.3f}s"
+                + (f" ({r['reason']})" if r['reason'] else ""))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#-------------------------------------------------------------------------------
+# Name:         mem_profile.py
+# Purpose:      Measures the memory used by players during each call the
+#               referee makes, and which lines of which modules allocated it
+#               Used by `python referee.py --memory_profile ...`
+#
+# Author:       Daniel Blain and Anjana Basani
+#
+# Created:      19/10/2026
+#-------------------------------------------------------------------------------
+
+import os
+import sys
+import tracemalloc
+
+PROFILE_FRAMES = 8 # frames of each allocation's traceback to keep
+PROFILE_TOP = 5 # allocation sites to report for each call
+WARN_FRACTION = 0.8 # warn once a call's peak reaches this much of the limit
+SHARED_MODULES = ['player_functions', 'search_cache', 'time_manager']
+
+class MemoryProfiler:
+    """
+    Class which uses tracemalloc to record, for each call made to a player,
+    the peak memory allocated during the call and the lines responsible for
+    the memory still held afterwards
+    The peak is measured above what was held before the call (by either
+    player), so it counts only this call's allocations. Allocation sites come
+    from a snapshot taken after the call, so memory freed before the call
+    returns (search stacks and board copies, say) is counted in the peak but
+    never attributed to a site
+    """
+    def __init__(self, modules, space_limit=0, top=PROFILE_TOP, verbose=True):
+        """
+        Start tracing memory allocations
+
+        :param modules: the names of the modules to attribute allocations to
+            (those shared by players are always included)
+        :param space_limit: the referee's limit on memory space (MB) for each
+            player, 0 for unlimited
+        :param top: the number of allocation sites to report for each call
+        :param verbose: whether to print a report after each call
+        """
+        self.space_limit = space_limit
+        self.top = top
+        self.verbose = verbose
+        self.files = set()
+        for m in SHARED_MODULES + list(modules):
+            if m in sys.modules and hasattr(sys.modules[m], '__file__'):
+                self.files.add(os.path.abspath(sys.modules[m].__file__))
+        self.calls = [] # one record per call, see after()
+        self.sites = {} # largest size held by each site, (file, line) -> bytes
+        self.base = 0 # memory traced before the current call (bytes)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_FRAMES)
+
+    def before(self):
+        """
+        Prepare to measure a call to a player
+        """
+        tracemalloc.reset_peak()
+        self.base, _ = tracemalloc.get_traced_memory()
+
+    def after(self, colour, call, turns=None):
+        """
+        Record the memory used by a call to a player
+
+        :param colour: the colour of the player which was called
+        :param call: the name of the method called ('init', 'action' or
+            'update')
+        :param turns: the turns argument of the call, if any
+        :return: a dictionary describing the call: its 'colour', 'call' and
+            'turns', the 'current' traced memory (bytes) after the call, the
+            'peak' memory (bytes) the call allocated on top of what was held
+            before it, and 'sites', a list of ('file:line', bytes) for the
+            largest allocation sites in the profiled modules, of the memory
+            still held after the call
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        peak -= self.base
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(True, f, all_frames=True) for f in self.files])
+        # attribute each allocation to the innermost profiled frame, so
+        # allocations made by library code are charged to their caller
+        sizes = {}
+        for trace in snapshot.traces:
+            # frames are stored oldest first
+            for frame in reversed(trace.traceback):
+                if frame.filename in self.files:
+                    site = (os.path.basename(frame.filename), frame.lineno)
+                    sizes[site] = sizes.get(site, 0) + trace.size
+                    break
+        for site, size in sizes.items():
+            self.sites[site] = max(self.sites.get(site, 0), size)
+        l_sites = sorted(sizes.items(), key=lambda s: -s[1])[:self.top]
+        record = {'colour': colour, 'call': call, 'turns': turns,
+            'current': current, 'peak': peak,
+            'sites': [(f"{s[0]}:{s[1]}", size) for s, size in l_sites]}
+        self.calls.append(record)
+        if self.verbose:
+            print(f"memory: {peak/2**20:.3f}MB (peak this call) "
+                + f"{current/2**20:.3f}MB (held after) ({colour} {call}), "
+                + "largest sites of memory held after:")
+            for site, size in record['sites']:
+                print(f"    {size/2**10:10.1f}KB  {site}")
+        if self.space_limit and peak > WARN_FRACTION * self.space_limit * 2**20:
+            print(f"warning: {colour} {call} peaked at {peak/2**20:.3f}MB, "
+                + f"near the {self.space_limit:.1f}MB space limit")
+        return record
+
+    def summary(self):
+        """
+        Summarise the calls recorded so far
+
+        :return: a dictionary with, for each colour, the largest 'peak' of any
+            of its calls (bytes) and the turn it happened in, and 'sites', a
+            list of ('file:line', bytes) of the largest size each allocation
+            site held after any call, largest first (memory freed within a
+            call is not attributed)
+        """
+        result = {}
+        for record in self.calls:
+            best = result.get(record['colour'])
+            if best is None or record['peak'] > best['peak']:
+                result[record['colour']] = {'peak': record['peak'],
+                    'call': record['call'], 'turns': record['turns']}
+        result['sites'] = [(f"{s[0]}:{s[1]}", size) for s, size in
+            sorted(self.sites.items(), key=lambda s: -s[1])[:self.top]]
+        return result
+
+    def print_summary(self):
+        """
+        Print the summary of the calls recorded so far (see summary)
+        """
+        result = self.summary()
+        for colour in ['white', 'black']:
+            if colour in result:
+                r = result[colour]
+                print(f"memory: {colour} peaked at {r['peak']/2**20:.3f}MB "
+                    + f"during {r['call']}"
+                    + (f" (turn {r['turns']})" if r['turns'] is not None
+                        else ""))
+        print("memory: largest allocation sites (of memory held after "
+            + "calls)")
+        for site, size in result['sites']:
+            print(f"    {size/2**10:10.1f}KB  {site}")
@@ -0,0 +1,81 @@
+#-------------------------------------------------------------------------------
+# Name:         opponent_model.py
+# Purpose:      Records the replies the AI player's search expects from its
+#               opponent, to judge how well the opponent actually plays
+#
+# Author:       Daniel Blain and Anjana Basani
+#
+# Created:      19/10/2026
+#-------------------------------------------------------------------------------
+
+class OpponentModel:
+    """
+    Class which collects the scores of the opponent's replies to each move, as
+    the search evaluates them, and compares the reply the opponent makes with
+    those expected after the move chosen
+    """
+    def __init__(self):
+        """
+        Initialise a model with no expectations
+        """
+        self.replies = {} # scores of replies, by move then reply
+        self.line = [None, None] # the move and reply being searched
+        self.expected = None # scores of replies to the move chosen, if any
+        self.mean = 0 # mean score of the expected replies
+        self.turns = 0 # the turn the expected replies would be made on
+
+    def clear(self):
+        """
+        Forget the replies found by the last search
+        """
+        self.replies.clear()
+
+    def record(self, score):
+        """
+        Record the score of the reply currently being searched (see line)
+
+        :param score: the score of the board state after the reply
+        """
+        r_scores = self.replies.get(self.line[0])
+        if r_scores is None:
+            r_scores = {}
+            self.replies[self.line[0]] = r_scores
+        r_scores[self.line[1]] = score
+
+    def predict(self, move, turns):
+        """
+        Expect the opponent to reply to a move
+
+        :param move: the move chosen, as ((column,row),(column,row))
+        :param turns: the turn the opponent will reply on
+        :return: a list of the replies predicted as best for the opponent
+        """
+        self.expected = self.replies.get(move)
+        self.turns = turns
+        if not self.expected:
+            # nothing to judge the opponent's reply against
+            self.expected = None
+            return []
+        self.mean = sum(self.expected.values()) / len(self.expected)
+        s_best = min(self.expected.values())
+        return [r for r, s in self.expected.items() if s == s_best]
+
+    def observe(self, action):
+        """
+        Find the score of the reply the opponent made, if it was expected
+
+        :param action: the opponent's move, as passed to Player.update
+        :return: the score found for the reply, or None if it wasn't searched
+        """
+        score = self.expected.get(action)
+        self.expected = None
+        return score
+
+    def played_well(self, score):
+        """
+        Judge whether a reply was better than the opponent's average one
+
+        :param score: the score of the board state after the reply
+        :return: True if the reply was noticeably better for the opponent
+        """
+        return score < self.mean - abs(self.mean/10)
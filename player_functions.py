@@ -7,31 +7,107 @@
 # Created:     20/04/2018
 #-------------------------------------------------------------------------------
 
+class LazyTable:
+    """
+    A precomputed table which is only built when it is first used, so that
+    importing a player module and creating a player stay cheap - the referee
+    counts both against the player's time limit
+    """
+    def __init__(self, builder):
+        """
+        Initialise a table without building it
+
+        :param builder: a function (taking no arguments) which builds the table
+        """
+        self.builder = builder
+        self.data = None
+
+    def get(self):
+        """
+        Returns the table, building it if not done already
+
+        :return: the table
+        """
+        if self.data is None:
+            self.data = self.builder()
+        return self.data
+
+def _reach_build():
+    """
+    Builds the table of squares within jumping distance of each square
+
+    :return: a 2D array (column, row) of lists of (column,row) locations,
+        including the square itself
+    """
+    l_reach = [[0,0],[-1,0],[1,0],[0,-1],[0,1],[-2,0],[2,0],[0,-2],[0,2]]
+    reach = [[[] for r in range(8)] for c in range(8)]
+    for c in range(8):
+        for r in range(8):
+            for d in l_reach:
+                if on_board(r+d[1], c+d[0]):
+                    reach[c][r].append((c+d[0], r+d[1]))
+    return reach
+
+REACH = LazyTable(_reach_build) # squares within jumping distance of a square
+
+PIECES = 8 # index of a board's piece sets, kept after its 8 columns
+
 def board_init():
     """
     Initialise a board
+    After its 8 columns, the board keeps the locations of each player's pieces
+    in the sets board[PIECES]['O'] and board[PIECES]['@'], so that functions
+    can visit pieces without scanning every square. Functions which change
+    the board keep these up to date; use piece_place to put a piece down
 
     :return: an empty game board, as a 2D array
     """
     b = [['-' for x in range(0,8)] for y in range(0,8)]
     for i in [[0,0], [0,7], [7,0], [7,7]]:
         b[i[0]][i[1]] = 'X'
-
+    b.append({'O': set(), '@': set()})
     return b
 
 def board_duplicate(board):
     """
     Returns a duplicate of the board
 
-    :param board: the board to duplicate
+    :param board: the board to duplicate (if it has no piece sets, as for a
+        board of only 8 columns, the copy has them added)
     :return: a copy of the input board
     """
-    n_board = [['-' for y in range(8)] for x in range(8)]
-    for r in range(8):
+    n_board = [board[c][:] for c in range(8)]
+    if len(board) > PIECES:
+        pieces = board[PIECES]
+        n_board.append({'O': set(pieces['O']), '@': set(pieces['@'])})
+    else:
+        pieces = {'O': set(), '@': set()}
         for c in range(8):
-            n_board[c][r] = board[c][r]
+            for r in range(8):
+                if n_board[c][r] in pieces:
+                    pieces[n_board[c][r]].add((c,r))
+        n_board.append(pieces)
     return n_board
 
+def _row_major(l):
+    """
+    Sort key which orders (column,row) locations row by row, as the loops of
+    eliminate visited them before boards kept piece sets
+
+    :param l: the location
+    :return: the key of the location
+    """
+    return (l[1], l[0])
+
+def board_key(board):
+    """
+    Returns a compact, hashable representation of the board
+
+    :param board: the board to represent
+    :return: a string of the board's squares, column by column
+    """
+    return ''.join([''.join(board[c]) for c in range(8)])
+
 def print_board(board):
     """
     Prints the current state of the input board
@@ -57,9 +133,9 @@ def on_board(row, col, shrinks=None):
         s = 0
     else:
         s = shrinks
-    if row not in range(s,8-s):
+    if row < s or row >= 8-s:
         return False # row invalid
-    if col not in range(s,8-s):
+    if col < s or col >= 8-s:
         return False # column invalid
     return True # position valid
 
@@ -70,13 +146,8 @@ def pieces_count(board):
     :param board: the board to check
     :return: the number of pieces on the board
     """
-    p_count = 0
-    p_set = ['O', '@']
-    for c in range(8):
-        for r in range(8):
-            if board[c][r] in p_set:
-                p_count += 1
-    return p_count
+    pieces = board[PIECES]
+    return len(pieces['O']) + len(pieces['@'])
 
 def get_shrinks(turns):
     """
@@ -92,6 +163,90 @@ def get_shrinks(turns):
     else:
         return 0
 
+def shrink_next(turns):
+    """
+    Returns the turn at which the board will next shrink
+
+    :param turns: the number of turns into the moving phase
+    :return: the turn of the next shrink, or None if it won't shrink again
+    """
+    if turns < 128:
+        return 128
+    elif turns < 192:
+        return 192
+    else:
+        return None
+
+def ring(row, col):
+    """
+    Returns which ring of the board a position is in (0 being the outermost)
+
+    :param row: the row of the position
+    :param col: the column of the position
+    :return: the number of shrinks which leave the position on the board
+    """
+    return min(row, col, 7-row, 7-col)
+
+def shrink_doomed_squares(shrinks):
+    """
+    Returns the squares the next shrink will remove, or turn into corners
+
+    :param shrinks: the number of times the board has shrunk
+    :return: a set of (column,row) locations
+    """
+    s = shrinks + 1 # shrinks after the next shrink
+    doomed = set()
+    for c in range(8):
+        for r in range(8):
+            if ring(r, c) < s:
+                doomed.add((c,r))
+    for n in [[s,s],[7-s,s],[7-s,7-s],[s,7-s]]:
+        doomed.add((n[0],n[1]))
+    return doomed
+
+def shrink_doomed(board, turns, piece):
+    """
+    Counts the pieces of a type which cannot escape the next shrink in time
+    Each piece outside the next shrink's ring needs one move per ring to escape
+    and only one piece can move per turn, so the pieces closest to safety are
+    assumed to escape first. Jumps and blocked squares are not considered
+
+    :param board: the board state to check
+    :param turns: the number of turns into the moving phase
+    :param piece: the piece type to check for (symbol)
+    :return: the number of pieces which will be lost to the shrink
+    """
+    t_shrink = shrink_next(turns)
+    if t_shrink is None:
+        return 0
+    s = get_shrinks(t_shrink) # shrinks after the next shrink
+    # white moves on even turns, black on odd turns
+    if piece == 'O':
+        first = turns + turns % 2
+    else:
+        first = turns + 1 - turns % 2
+    m_left = max(0, int((t_shrink - first + 1)/2)) # moves before the shrink
+    corners = [(s,s),(7-s,s),(7-s,7-s),(s,7-s)]
+    l_needed = [] # moves each threatened piece needs to reach safety
+    for (c, r) in board[PIECES][piece]:
+        k = ring(r, c)
+        if k < s:
+            l_needed.append(s - k)
+        elif (c,r) in corners:
+            # must leave the new corner, along the ring
+            l_needed.append(1)
+    if m_left >= sum(l_needed):
+        # time for every piece to escape
+        return 0
+    l_needed.sort()
+    doomed = len(l_needed)
+    for n in l_needed:
+        if n > m_left:
+            break
+        m_left -= n
+        doomed -= 1
+    return doomed
+
 def can_move(board, row, column, shrinks, direction):
     """
     Checks whether an indicated piece can move in the indicated direction
@@ -123,9 +278,8 @@ def can_move(board, row, column, shrinks, direction):
             if board[column][row+1] == '-':
                 # can move down
                 return True
-    else:
-        # cannot perform desired move
-        return False
+    # cannot perform desired move
+    return False
 
 def can_jump(board, row, column, shrinks, direction):
     """
@@ -139,29 +293,29 @@ def can_jump(board, row, column, shrinks, direction):
     :param direction: the desired jumping direction
     :return: True if the desired jump is possible, False otherwise
     """
+    p_set = ('O', '@') # only pieces can be jumped over
     if direction == "left":
         if on_board(row, column-2, shrinks):
-            if board[column-2][row] == '-':
+            if board[column-2][row] == '-' and board[column-1][row] in p_set:
                 # can jump left
                 return True
     elif direction == "right":
         if on_board(row, column+2, shrinks):
-            if board[column+2][row] == '-':
+            if board[column+2][row] == '-' and board[column+1][row] in p_set:
                 # can jump right
                 return True
     elif direction == "up":
         if on_board(row-2, column, shrinks):
-            if board[column][row-2] == '-':
+            if board[column][row-2] == '-' and board[column][row-1] in p_set:
                 # can jump up
                 return True
     elif direction == "down":
         if on_board(row+2, column, shrinks):
-            if board[column][row+2] == '-':
+            if board[column][row+2] == '-' and board[column][row+1] in p_set:
                 # can jump down
                 return True
-    else:
-        # cannot perform desired jump
-        return False
+    # cannot perform desired jump
+    return False
 
 def moves_available(board, my_p, shrinks):
     """
@@ -174,19 +328,123 @@ def moves_available(board, my_p, shrinks):
     """
     moves = 0
     directions = ["left","right","up","down"]
-    for r in range(0,8):
-        for c in range(0,8):
-            # check each relevant piece on the board
-            if board[c][r] == my_p:
-                for d in directions:
-                    if can_move(board,r,c,shrinks,d) is not None:
-                        # a piece can move
-                        moves += 1
-                    elif can_jump(board,r,c,shrinks,d)is not None:
-                        # a piece can jump instead
-                        moves += 1
+    for (c, r) in board[PIECES][my_p]:
+        # check each relevant piece on the board
+        for d in directions:
+            if can_move(board,r,c,shrinks,d):
+                # a piece can move
+                moves += 1
+            elif can_jump(board,r,c,shrinks,d):
+                # a piece can jump instead
+                moves += 1
     return moves
 
+def piece_moves(board, row, col, shrinks):
+    """
+    Lists the directions an indicated piece can move or jump in
+
+    :param board: the board state to check
+    :param row: the row of the piece
+    :param col: the column of the piece
+    :param shrinks: the number of times the board has shrunk
+    :return: a list of the directions the piece can move in
+    """
+    l_dirs = []
+    for d in ["left","right","up","down"]:
+        if can_move(board, row, col, shrinks, d):
+            l_dirs.append(d)
+        elif can_jump(board, row, col, shrinks, d):
+            l_dirs.append(d)
+    return l_dirs
+
+def moves_table(board, my_p, shrinks):
+    """
+    Builds a table of the legal moves of each piece of the indicated type
+
+    :param board: the board state to check
+    :param my_p: the piece type to check for (symbol)
+    :param shrinks: the number of times the board has shrunk
+    :return: a dictionary mapping each piece location (column,row) to a list of
+        the directions that piece can move in
+    """
+    table = {}
+    for (c, r) in sorted(board[PIECES][my_p]):
+        table[(c,r)] = piece_moves(board, r, c, shrinks)
+    return table
+
+def moves_table_update(table, board, my_p, shrinks, changed):
+    """
+    Updates a table of legal moves after some squares of the board changed
+    Only pieces within jumping distance of a changed square are checked again
+
+    :param table: the move table to update (see moves_table)
+    :param board: the board state after the change
+    :param my_p: the piece type the table is for (symbol)
+    :param shrinks: the number of times the board has shrunk
+    :param changed: a list of the (column,row) locations which changed
+    :return: the updated move table
+    """
+    reach = REACH.get()
+    for l in changed:
+        for (dc, dr) in reach[l[0]][l[1]]:
+            if board[dc][dr] == my_p:
+                # piece here may have gained or lost moves
+                table[(dc,dr)] = piece_moves(board, dr, dc, shrinks)
+            elif (dc,dr) in table:
+                # piece has moved away or been eliminated
+                del table[(dc,dr)]
+    return table
+
+def moves_count(table):
+    """
+    Counts the number of moves in a table of legal moves
+
+    :param table: the move table to check (see moves_table)
+    :return: the total number of moves possible
+    """
+    moves = 0
+    for l_dirs in table.values():
+        moves += len(l_dirs)
+    return moves
+
+def piece_place(board, row, col, piece):
+    """
+    Puts a piece on an empty square
+
+    :param board: the board to update
+    :param row: the row to place the piece in
+    :param col: the column to place the piece in
+    :param piece: the piece type to place (symbol)
+    """
+    board[col][row] = piece
+    board[PIECES][piece].add((col,row))
+
+def _piece_remove(board, row, col, symbol='-'):
+    """
+    Takes a piece off the board
+
+    :param board: the board to update
+    :param row: the row of the piece
+    :param col: the column of the piece
+    :param symbol: the symbol to leave on the square
+    """
+    board[PIECES][board[col][row]].discard((col,row))
+    board[col][row] = symbol
+
+def _piece_moved(board, l_from, l_to):
+    """
+    Updates the piece sets of a board after a piece has moved
+
+    :param board: the board which was updated
+    :param l_from: the location the piece moved from (column,row)
+    :param l_to: the location the piece moved to (column,row)
+    """
+    p = board[l_to[0]][l_to[1]]
+    if p in ('O', '@'):
+        pieces = board[PIECES][p]
+        pieces.discard(l_from)
+        pieces.add(l_to)
+
 def piece_move(board, row, col, direction):
     """
     Moves a piece in the indicated direction
@@ -219,6 +477,7 @@ def piece_move(board, row, col, direction):
         board[col][row+1] = board[col][row]
         board[col][row] = '-'
         l = (col,row+1)
+    _piece_moved(board, (col,row), l)
     return l # returns new location
 
 def piece_jump(board, row, col, direction):
@@ -253,6 +512,7 @@ def piece_jump(board, row, col, direction):
         board[col][row+2] = board[col][row]
         board[col][row] = '-'
         l = (col,row+2)
+    _piece_moved(board, (col,row), l)
     return l # returns new position
 
 def move_perform(board, row, col, shrinks, direction):
@@ -292,21 +552,46 @@ def dist_enemy(board, row, col):
     else:
         enemy = 'O'
     dist_nearest = 10000
-    for c in range(8):
-        for r in range(8):
-            if board[c][r] == enemy:
-                # enemy here, update distance if nearer
-                dist = abs(c-col) + abs(r-row)
-                if dist < dist_nearest:
-                    dist_nearest = dist
-                if dist == 1:
-                    # couldn't get nearer, just return 1
-                    return 1
+    for (c, r) in board[PIECES][enemy]:
+        # enemy here, update distance if nearer
+        dist = abs(c-col) + abs(r-row)
+        if dist < dist_nearest:
+            dist_nearest = dist
+        if dist == 1:
+            # couldn't get nearer, just return 1
+            return 1
     if dist_nearest != 10000:
         return dist_nearest
     else:
         return -1
 
+def enemy_distances(board):
+    """
+    Finds how close every piece is to its nearest enemy, in a single pass over
+    each pair of opposing pieces
+
+    :param board: the board state to check
+    :return: a dictionary mapping each piece type ('O' and '@') to a dictionary
+        mapping the location (column,row) of each of its pieces to the
+        distance of the nearest enemy, as a sum of the row and column
+        differences (pieces are left out if there are no enemies)
+    """
+    pieces = board[PIECES]
+    nearest = {'O': {}, '@': {}}
+    n_white = nearest['O']
+    n_black = nearest['@']
+    for (wc, wr) in pieces['O']:
+        d_white = 16 # further than any enemy could be
+        for l in pieces['@']:
+            d = abs(wc-l[0]) + abs(wr-l[1])
+            if d < d_white:
+                d_white = d
+            if d < n_black.get(l, 16):
+                n_black[l] = d
+        if d_white < 16:
+            n_white[(wc,wr)] = d_white
+    return nearest
+
 def piece_adjacent(board, row, col, piece):
     """
     Determines whether there is a specified piece adjacent to a specified place
@@ -317,7 +602,7 @@ def piece_adjacent(board, row, col, piece):
     :param piece: the type of piece to check for
     :return: True if the indicated piece type is adjacent, False otherwise
     """
-    l_adjacent = [[-1,0],[1,0],[0,1],[0,-1]]
+    l_adjacent = ((-1,0),(1,0),(0,1),(0,-1))
     for l in l_adjacent:
         dr = row + l[1]
         dc = col + l[0]
@@ -339,7 +624,7 @@ def piece_jumpto(board, row, col, piece):
     if board[col][row] == '-':
         # piece couldn't go here anyway
         return False
-    l_adjacent = [[-1,0],[1,0],[0,1],[0,-1]]
+    l_adjacent = ((-1,0),(1,0),(0,1),(0,-1))
     for l in l_adjacent:
         dr = row + l[1]
         dc = col + l[0]
@@ -366,20 +651,20 @@ def surrounded(board, row, col):
     # know what is 'dangerous'
     if p == 'O':
         # white piece
-        e = ['@','X']
+        e = ('@','X')
     elif p == '@':
         # black piece
-        e = ['O','X']
+        e = ('O','X')
     else:
         # not a piece
         return False
-    check = [[[0,-1],[0,1]],[[-1,0],[1,0]]] # relative positions to check
-    for c in check:
-        a = [c[0][0]+row, c[0][1]+col] # one side
-        b = [c[1][0]+row, c[1][1]+col] # other side
-        if on_board(a[0], a[1]) and on_board(b[0], b[1]):
+    check = ((0,1),(1,0)) # relative positions (row,column) of the sides
+    for (dr, dc) in check:
+        ra, ca = row-dr, col-dc # one side
+        rb, cb = row+dr, col+dc # other side
+        if on_board(ra, ca) and on_board(rb, cb):
             # both positions are legal
-            if board[b[1]][b[0]] in e and board[a[1]][a[0]] in e:
+            if board[cb][rb] in e and board[ca][ra] in e:
                 # surrounded by enemies!
                 return True
     # not surrounded
@@ -399,10 +684,10 @@ def can_surround_vert(board, row, col):
     if p not in ['O', '@']:
         return None
     if p == 'O':
-        e = ['@', 'X'] # hazards for white
+        e = ('@', 'X') # hazards for white
     else:
-        e = ['O', 'X'] # hazards for black
-    l_adjacent = [-1,1] # relative adjacent locations
+        e = ('O', 'X') # hazards for black
+    l_adjacent = (-1,1) # relative adjacent locations
     for l in l_adjacent:
         nc = col
         nr = l + row
@@ -434,10 +719,10 @@ def can_surround_hori(board, row, col):
     if p not in ['O', '@']:
         return None
     if p == 'O':
-        e = ['@', 'X'] # hazards for white
+        e = ('@', 'X') # hazards for white
     else:
-        e = ['O', 'X'] # hazards for black
-    l_adjacent = [-1,1] # relative adjacent locations
+        e = ('O', 'X') # hazards for black
+    l_adjacent = (-1,1) # relative adjacent locations
     for l in l_adjacent:
         nc = col + l
         nr = row
@@ -471,10 +756,10 @@ def can_surround(board, row, col):
     if p not in ['O', '@']:
         return None
     if p == 'O':
-        e = ['@', 'X'] # hazards for white
+        e = ('@', 'X') # hazards for white
     else:
-        e = ['O', 'X'] # hazards for black
-    l_adjacent = [[-1,0],[1,0],[0,-1],[0,1]] # relative adjacent locations
+        e = ('O', 'X') # hazards for black
+    l_adjacent = ((-1,0),(1,0),(0,-1),(0,1)) # relative adjacent locations
     for l in l_adjacent:
         nc = l[0] + col
         nr = l[1] + row
@@ -492,31 +777,88 @@ def can_surround(board, row, col):
     # cannot get surrounded here
     return None
 
-def eliminate(board, e_first, e_second):
+def threat_map(board, shrinks):
+    """
+    Determines, for each player, which squares would surround an enemy piece if
+    the player occupied them, and which of the player's pieces can reach them
+
+    :param board: the board to check
+    :param shrinks: the number of times the board has shrunk
+    :return: a dictionary mapping each piece type ('O' and '@') to a dictionary
+        with entries:
+        'targets': maps each enemy location (column,row) to a list of the
+            squares which would surround it vertically and horizontally (each
+            None if no such square exists)
+        'squares': maps each of these squares to a list of the enemy locations
+            it would surround
+        'reach': maps each of these squares to a list of the player's pieces
+            which could move there (entry format [column,row,jump])
+        'nearest': maps each of the player's pieces to the distance of its
+            nearest enemy (see enemy_distances)
+    """
+    threats = {}
+    nearest = enemy_distances(board)
+    for p in ['O', '@']:
+        threats[p] = {'targets': {}, 'squares': {}, 'reach': {},
+            'nearest': nearest[p]}
+    l_adjacent = ((-1,0),(1,0),(0,-1),(0,1))
+    lo, hi = shrinks, 8-shrinks # bounds of the board (see on_board)
+    pieces = board[PIECES]
+    for (c, r) in sorted(pieces['O'] | pieces['@']):
+        p = board[c][r]
+        if p == 'O':
+            t = threats['@'] # threats posed by black
+        else:
+            t = threats['O'] # threats posed by white
+        a = '@' if p == 'O' else 'O' # the threatening piece type
+        l_threat = [can_surround_vert(board, r, c),
+            can_surround_hori(board, r, c)]
+        t['targets'][(c,r)] = l_threat
+        for l in l_threat:
+            if l is None:
+                continue
+            if l in t['squares']:
+                t['squares'][l].append((c,r))
+                continue
+            t['squares'][l] = [(c,r)]
+            # find the pieces which could occupy this square
+            reach = []
+            for d in l_adjacent:
+                # try a movement first
+                tx = l[0] + d[0]
+                ty = l[1] + d[1]
+                if lo <= tx < hi and lo <= ty < hi:
+                    if board[tx][ty] == a:
+                        reach.append([tx,ty,False])
+                        continue
+                # one can't just move there, try a jump
+                tx += d[0]
+                ty += d[1]
+                if lo <= tx < hi and lo <= ty < hi:
+                    if board[tx][ty] == a:
+                        reach.append([tx,ty,True])
+            t['reach'][l] = reach
+    return threats
+
+def eliminate(board, e_first, e_second, removed=None):
     """
     Updates the given board so that pieces are eliminated correctly
 
     :param board: the current board state
     :param e_first: the first kind of piece to eliminate
     :param e_second: the second kind of piece to eliminate
+    :param removed: a list to add the (column,row) locations of eliminated
+        pieces to (optional)
     :return board: the updated board state
     """
-    # check through pieces of type e_first first
-    for r in range(0,8):
-        for c in range(0,8):
-            if board[c][r] == e_first:
-                # right piece kind
-                if surrounded(board, r, c):
-                    # surrounded! delete
-                    board[c][r] = '-'
-    # check through pieces of type e_second after
-    for r in range(0,8):
-        for c in range(0,8):
-            if board[c][r] == e_second:
-                # right piece kind
-                if surrounded(board, r, c):
-                    # surrounded! delete
-                    board[c][r] = '-'
+    # check through pieces of type e_first first, then e_second
+    for p in [e_first, e_second]:
+        for (c, r) in sorted(board[PIECES][p], key=_row_major):
+            if surrounded(board, r, c):
+                # surrounded! delete
+                _piece_remove(board, r, c)
+                if removed is not None:
+                    removed.append((c,r))
     # done eliminating
     return board
 
@@ -528,13 +870,13 @@ def corner_eliminate(board, corner):
     :param corner: the co-ordinates of the corner
     :return: the updated board state
     """
-    l_locations = [[-1,0],[1,0],[0,1],[0,-1]]
+    l_locations = ((-1,0),(1,0),(0,1),(0,-1))
     for l in l_locations:
         dr = l[0] + corner[0]
         dc = l[1] + corner[1]
         if on_board(dr, dc):
             if surrounded(board, dr, dc):
-                board[dc][dr] = '-'
+                _piece_remove(board, dr, dc)
     return board
 
 def shrink(board, shrinks):
@@ -551,12 +893,18 @@ def shrink(board, shrinks):
             # check if space now 'out of bounds'
             if r < s or c < s or r > 7-s or c > 7-s:
                 # replace with arbitrary symbol (not O, @, - or X)
-                board[c][r] = ' '
+                if board[c][r] in ('O', '@'):
+                    _piece_remove(board, r, c, ' ')
+                else:
+                    board[c][r] = ' '
     # new corner locations
     n_corners = [[s,s],[7-s,s],[7-s,7-s],[s,7-s]]
     for n in n_corners:
-        # place new corners
-        board[n[1]][n[0]] = 'X'
+        # place new corners (removing any piece there)
+        if board[n[1]][n[0]] in ('O', '@'):
+            _piece_remove(board, n[0], n[1], 'X')
+        else:
+            board[n[1]][n[0]] = 'X'
         corner_eliminate(board, n)
     return board
 
@@ -576,13 +924,13 @@ def update(board, action, p_my, p_op):
     elif (type(action[0]) == int):
         # a tuple of ints, so a piece was placed
         (y, x) = action
-        board[y][x] = p_op
+        piece_place(board, x, y, p_op)
         eliminate(board, p_my, p_op)
     else:
         # a tuple of tuples, so a piece was moved
         ((ya, xa), (yb, xb)) = action
-        board[ya][xa] = '-'
-        board[yb][xb] = p_op
+        _piece_remove(board, xa, ya)
+        piece_place(board, xb, yb, p_op)
         eliminate(board, p_my, p_op)
     # updated!
     return board
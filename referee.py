@@ -6,8 +6,10 @@ version: v1.2
 
 import gc
 import time
+import random
 import argparse
 import importlib
+import multiprocessing
 
 VERSION_INFO = """Referee version 1.2 (released May 07 2018)
 Plays a basic game of Watch Your Back! between two Player classes
@@ -22,53 +24,158 @@ def main():
     options = _Options()
     print(VERSION_INFO)
 
+    profiler = None
+    if options.memory_profile:
+        # only needed (and only slowing the game down) when asked for
+        from mem_profile import MemoryProfiler
+        profiler = MemoryProfiler([options.white_player.__module__,
+            options.black_player.__module__], options.space,
+            options.memory_profile)
+
+    play(options.white_player, options.black_player, options.time,
+        options.space, options.delay, profiler=profiler,
+        isolate=options.isolate)
+
+    if profiler is not None:
+        profiler.print_summary()
+
+def play(white_class, black_class, time_limit=0, space_limit=0, delay=0,
+        verbose=True, seed=None, profiler=None, isolate=False):
+    """
+    Play a game of Watch Your Back! between two Player classes.
+
+    :param white_class: the Player class (a class object) playing White
+    :param black_class: the Player class (a class object) playing Black
+    :param time_limit: limit on CPU time (float, seconds) for each player, 0 for
+        unlimited
+    :param space_limit: limit on memory space (float, MB) for each player, 0 for
+        unlimited
+    :param delay: how long (float, seconds) to wait between turns
+    :param verbose: whether to print the game's progress and resource usage
+    :param seed: if not None, seed the random module with this value once both
+        players are initialised (players may reseed it themselves)
+    :param profiler: if not None, a mem_profile.MemoryProfiler to record the
+        memory used by each call to a player
+    :param isolate: whether to run each player in its own process (see
+        _ProcessPlayer), so that each player's time and space are measured
+        (and limited) separately; can't be used with a profiler
+    :return: a dictionary describing the result: 'winner' ('W', 'B', 'draw' or
+        None if the game did not finish), 'reason' (None, or a message
+        explaining an unfinished game), 'phase' and 'turns' (how far the game
+        progressed), 'time' (each player's total CPU time, by colour) and, if
+        isolated, 'space' (each player's peak memory usage in MB, by colour)
+    """
+    if isolate and profiler is not None:
+        raise ValueError("memory profiling needs the players in this process")
     # initialise the game and players
     game  = _Game()
+    result = {'winner': None, 'reason': None, 'time': {}}
+    players = [] # player processes to stop once the game is over
     try:
-        white = _Player(options.white_player,'white',options.time,options.space)
-        black = _Player(options.black_player,'black',options.time,options.space)
-    except _ResourceLimitException as e:
-        print(f"resource limit exceeded during initialisation:", e)
-        return
+        try:
+            if isolate:
+                white = _ProcessPlayer(white_class, 'white', time_limit,
+                    space_limit, verbose)
+                players.append(white)
+                white.init()
+                black = _ProcessPlayer(black_class, 'black', time_limit,
+                    space_limit, verbose)
+                players.append(black)
+                black.init()
+            else:
+                white = _Player(white_class, 'white', time_limit,
+                    space_limit, verbose, profiler)
+                black = _Player(black_class, 'black', time_limit,
+                    space_limit, verbose, profiler)
+        except _ResourceLimitException as e:
+            _report(verbose, f"resource limit exceeded during initialisation:",
+                e)
+            result['reason'] = ("resource limit exceeded during "
+                + f"initialisation: {e}")
+            return _result(result, game)
+        return _play(game, result, white, black, delay, verbose, seed)
+    finally:
+        for p in players:
+            p.close()
+        if isolate:
+            # result is the dictionary being returned
+            result['space'] = {p.colour: p.peak for p in players}
+
+def _play(game, result, white, black, delay, verbose, seed):
+    """
+    Play a game between two initialised players (see play)
+
+    :return: the completed result dictionary
+    """
+    if seed is not None:
+        random.seed(seed)
 
     # now, play the game!
     player, opponent = white, black # white has first move
-    print(game)
+    _report(verbose, game)
+    result['time'] = {'white': white.timer, 'black': black.timer}
 
     while game.playing():
-        if options.delay:
-            time.sleep(options.delay)
+        if delay:
+            time.sleep(delay)
         turns = game.turns
         try:
             action = player.action(turns)
         except _ResourceLimitException as e:
             # looks like one of the players exceeded their resource limits
             # during calculation of 'action'---that's the end of this game, then
-            print(f"resource limit exceeded during action():", e)
-            return
+            _report(verbose, f"resource limit exceeded during action():", e)
+            result['reason'] = f"resource limit exceeded during action(): {e}"
+            result['loser'] = game._piece()
+            return _result(result, game)
 
         try:
             game.update(action)
         except _InvalidActionException as e:
             # if one of the players makes an invalid action,
             # print the error message
-            print(f"invalid action ({game.loser}):", e)
+            _report(verbose, f"invalid action ({game.loser}):", e)
+            result['reason'] = f"invalid action ({game.loser}): {e}"
             break
 
-        print(game)
+        _report(verbose, game)
 
         try:
             opponent.update(action)
         except _ResourceLimitException as e:
             # looks like one of the players exceeded their resource limits
             # during calculation of 'update'
-            print(f"resource limit exceeded during update():", e)
-            return
+            _report(verbose, f"resource limit exceeded during update():", e)
+            result['reason'] = f"resource limit exceeded during update(): {e}"
+            result['loser'] = game._piece() # now on move
+            return _result(result, game)
 
         # other player's turn!
         player, opponent = opponent, player
 
-    print(f'winner: {game.winner}!')
+    _report(verbose, f'winner: {game.winner}!')
+    return _result(result, game)
+
+def _report(verbose, *message):
+    """Print a message about the game's progress, if printing is enabled"""
+    if verbose:
+        print(*message)
+
+def _result(result, game):
+    """
+    Complete a result dictionary (see play) from the final game state.
+    A player who exceeded a resource limit loses the game.
+    """
+    if game.winner is not None:
+        result['winner'] = game.winner
+    elif 'loser' in result:
+        result['winner'] = 'W' if result['loser'] == 'B' else 'B'
+    result.pop('loser', None)
+    result['phase'] = game.phase
+    result['turns'] = game.turns
+    result['time'] = {colour: timer.clock
+        for colour, timer in result['time'].items()}
+    return result
 
 # --------------------------------------------------------------------------- #
 
@@ -78,11 +185,13 @@ def main():
 DELAY_DEFAULT = 0
 SPACE_LIMIT_DEFAULT = 0
 TIME_LIMIT_DEFAULT  = 0
+MEMORY_PROFILE_DEFAULT = 0
 
 # missing values (to use if flag is provided, but with no value)
 DELAY_NOVALUE = 1.0 # seconds
 SPACE_LIMIT_NOVALUE = 100.0 # MB (each)
 TIME_LIMIT_NOVALUE  = 120.0 # seconds (each)
+MEMORY_PROFILE_NOVALUE = 5 # allocation sites (per call)
 
 
 class _Options:
@@ -91,6 +200,7 @@ class _Options:
 
     --- help message: ---
     usage: referee.py [-h] [-d [DELAY]] [-s [SPACE_LIMIT]] [-t [TIME_LIMIT]]
+                      [-m [MEMORY_PROFILE]] [-i]
                       white_module black_module
 
     Plays a game of Watch Your Back! between two Player classes
@@ -107,6 +217,11 @@ class _Options:
                             limit on memory space (float, MB) for each player
       -t [TIME_LIMIT], --time_limit [TIME_LIMIT]
                             limit on CPU time (float, seconds) for each player
+      -m [MEMORY_PROFILE], --memory_profile [MEMORY_PROFILE]
+                            trace memory allocated by the players, reporting
+                            this many (int) allocation sites after each call
+      -i, --isolate         run each player in its own process, measuring (and
+                            limiting) their time and space separately
     ---------------------
     """
     def __init__(self):
@@ -126,6 +241,13 @@ class _Options:
         parser.add_argument('-t', '--time_limit',
                 type=float, default=TIME_LIMIT_DEFAULT,  nargs="?",
                 help="limit on CPU time (float, seconds) for each player")
+        parser.add_argument('-m', '--memory_profile',
+                type=int, default=MEMORY_PROFILE_DEFAULT, nargs="?",
+                help="trace memory allocated by the players, reporting this "
+                    "many (int) allocation sites after each call")
+        parser.add_argument('-i', '--isolate', action='store_true',
+                help="run each player in its own process, measuring (and "
+                    "limiting) their time and space separately")
 
         args = parser.parse_args()
 
@@ -134,6 +256,11 @@ class _Options:
         self.delay = _novalue_check(args.delay, DELAY_NOVALUE)
         self.space = _novalue_check(args.space_limit, SPACE_LIMIT_NOVALUE)
         self.time  = _novalue_check(args.time_limit, TIME_LIMIT_NOVALUE)
+        self.memory_profile = _novalue_check(args.memory_profile,
+                MEMORY_PROFILE_NOVALUE)
+        self.isolate = args.isolate
+        if self.isolate and self.memory_profile:
+            parser.error("--memory_profile can't be used with --isolate")
 
 # HELPER FUNCTIONS
 
@@ -164,28 +291,138 @@ class _Player:
     """
     Wrapper for a Player class to simplify initialization and resource limiting
     """
-    def __init__(self, player_class, colour, time_limit, space_limit):
-        self.timer = _CountdownTimer(time_limit)
+    def __init__(self, player_class, colour, time_limit, space_limit,
+            verbose=True, profiler=None):
+        self.timer = _CountdownTimer(time_limit, verbose)
         self.space_limit = space_limit
+        self.verbose = verbose
+        self.colour = colour
+        self.profiler = profiler
 
         gc.collect() # off the clock
+        self._profile_start()
         with self.timer:
             self.player = player_class(colour)
-        _space_check(self.space_limit)
+        self._profile_end('init')
+        _space_check(self.space_limit, self.verbose)
 
     def update(self, move):
         gc.collect()
+        self._profile_start()
         with self.timer:
             self.player.update(move)
-        _space_check(self.space_limit)
+        self._profile_end('update')
+        _space_check(self.space_limit, self.verbose)
 
     def action(self, turns):
         gc.collect()
+        self._profile_start()
         with self.timer:
             action = self.player.action(turns)
-        _space_check(self.space_limit)
+        self._profile_end('action', turns)
+        _space_check(self.space_limit, self.verbose)
         return action
 
+    def _profile_start(self):
+        if self.profiler is not None:
+            self.profiler.before()
+
+    def _profile_end(self, call, turns=None):
+        if self.profiler is not None:
+            self.profiler.after(self.colour, call, turns)
+
+def _player_process(conn, player_class, colour):
+    """
+    Run a player in a process of its own, making the calls the referee sends
+    through a pipe until told to stop (by a None call)
+    Each call is answered with its return value (or the exception it raised),
+    the CPU time it took and this process' current and peak memory usage
+    (MB), not counting what the process was using before the player was made
+    """
+    base_mem_usage, _ = _get_rss_usage()
+    player = None
+    while True:
+        call, args = conn.recv()
+        if call is None:
+            break
+        gc.collect() # off the clock
+        start = time.process_time()
+        try:
+            if call == 'init':
+                player = player_class(colour)
+                r_val = None
+            else:
+                r_val = getattr(player, call)(*args)
+        except Exception as e:
+            r_val = e
+        elapsed = time.process_time() - start
+        curr_mem_usage, peak_mem_usage = _get_rss_usage()
+        conn.send((r_val, elapsed, curr_mem_usage - base_mem_usage,
+            peak_mem_usage - base_mem_usage))
+    conn.close()
+
+class _ProcessPlayer:
+    """
+    Wrapper for a Player class which runs it in its own process, so that its
+    CPU time and memory usage are measured apart from the referee's and the
+    other player's
+    """
+    def __init__(self, player_class, colour, time_limit, space_limit,
+            verbose=True):
+        self.timer = _CountdownTimer(time_limit, verbose)
+        self.space_limit = space_limit
+        self.verbose = verbose
+        self.colour = colour
+        self.peak = 0 # peak memory usage (MB) of the player's process
+
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_player_process,
+            args=(child_conn, player_class, colour), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def init(self):
+        """
+        Make the player, in its process
+        Kept apart from __init__, so that the process can be stopped (by
+        close) even if making the player fails
+        """
+        self._call('init')
+
+    def update(self, move):
+        self._call('update', move)
+
+    def action(self, turns):
+        return self._call('action', turns)
+
+    def close(self):
+        """Stop the player's process"""
+        try:
+            self.conn.send((None, ()))
+        except OSError:
+            # already gone
+            pass
+        self.process.join()
+        self.conn.close()
+
+    def _call(self, call, *args):
+        """
+        Make a call in the player's process, then check its resource usage
+        Exceptions raised by the player are raised again here
+        """
+        self.conn.send((call, args))
+        r_val, elapsed, curr_mem_usage, peak_mem_usage = self.conn.recv()
+        if isinstance(r_val, Exception):
+            raise r_val
+        self.peak = max(self.peak, peak_mem_usage)
+        self.timer.add(elapsed)
+        if self.verbose:
+            print(f"space: {curr_mem_usage:.3f}MB (current usage) "
+                + f"{peak_mem_usage:.3f}MB (max usage) ({self.colour})")
+        if self.space_limit and peak_mem_usage > self.space_limit:
+            raise _ResourceLimitException("Player exceeded space limit")
+        return r_val
+
 # HELPER CLASSES AND FUNCTIONS
 
 class _ResourceLimitException(Exception):
@@ -207,6 +444,19 @@ def _get_space_usage():
                 peak_mem_usage = int(line.split()[1]) / 1024 # kB -> MB
     return curr_mem_usage, peak_mem_usage
 
+def _get_rss_usage():
+    """
+    Find the current and peak resident memory usage of the current process, in
+    MB (unlike virtual memory, this only counts memory actually in use)
+    """
+    with open("/proc/self/status") as proc_status:
+        for line in proc_status:
+            if 'VmRSS:' in line:
+                curr_mem_usage = int(line.split()[1]) / 1024 # kB -> MB
+            elif 'VmHWM:' in line:
+                peak_mem_usage = int(line.split()[1]) / 1024 # kB -> MB
+    return curr_mem_usage, peak_mem_usage
+
 # by default, the python interpreter uses a significant amount of space
 # measure this first to later subtract from all measurements
 try:
@@ -214,15 +464,16 @@ try:
 except:
     print("note: unable to measure memory usage on this platform (try dimefox)")
 
-def _space_check(limit):
+def _space_check(limit, verbose=True):
     """
     Check up on the current and peak space usage of the process, printing
-    stats and ensuring that peak usage is not exceeding limits
+    stats (if verbose) and ensuring that peak usage is not exceeding limits
     """
     try:
         curr_mem_usage, peak_mem_usage = _get_space_usage()
     except:
-        print("unable to measure memory usage on this platform")
+        if verbose:
+            print("unable to measure memory usage on this platform")
         return
 
     # adjust measurements to reflect usage of players and referee, not
@@ -230,8 +481,9 @@ def _space_check(limit):
     curr_mem_usage -= _DEFAULT_MEM_USAGE
     peak_mem_usage -= _DEFAULT_MEM_USAGE
 
-    print(f"space: {curr_mem_usage:.3f}MB (current usage) "
-        + f"{peak_mem_usage:.3f}MB (max usage) (both players)")
+    if verbose:
+        print(f"space: {curr_mem_usage:.3f}MB (current usage) "
+            + f"{peak_mem_usage:.3f}MB (max usage) (both players)")
 
     # if we are limited, let's hope we are not out of space!
     # double the limit because space usage is shared
@@ -248,22 +500,29 @@ class _CountdownTimer:
     * if limit is not 0, throws an exception upon exiting the context after the
       allocated time has passed
     """
-    def __init__(self, limit):
+    def __init__(self, limit, verbose=True):
         """
         Create a new countdown timer with time limit `limit`, in seconds
-        (0 for unlimited time)
+        (0 for unlimited time), printing the time taken on exit if `verbose`
         """
         self.limit = limit
         self.clock = 0
+        self.verbose = verbose
     def __enter__(self):
         # start timing
         self.start = time.process_time()
         return self # unused
     def __exit__(self, exc_type, exc_val, exc_tb):
         # accumulate elapsed time since __enter__
-        elapsed = time.process_time() - self.start
+        self.add(time.process_time() - self.start)
+    def add(self, elapsed):
+        """
+        Accumulate time measured elsewhere (e.g. by a player's own process)
+        """
         self.clock += elapsed
-        print(f"time: {elapsed:.3f}s (this turn), {self.clock:.3f}s (total)")
+        if self.verbose:
+            print(f"time: {elapsed:.3f}s (this turn), "
+                + f"{self.clock:.3f}s (total)")
 
         # if we are limited, let's hope we aren't out of time!
         if self.limit and self.clock > self.limit:
@@ -0,0 +1,129 @@
+#-------------------------------------------------------------------------------
+# Name:         search_cache.py
+# Purpose:      Bounded caches used by the AI player to avoid repeating work
+#               between (and within) searches
+#
+# Author:       Daniel Blain and Anjana Basani
+#
+# Created:      19/10/2026
+#-------------------------------------------------------------------------------
+
+from collections import OrderedDict # keeps entries in order of last use
+
+class EvalCache:
+    """
+    Cache of board scores, which discards the least recently used entries
+    once it is full
+    """
+    def __init__(self, size):
+        """
+        Initialise an empty cache
+
+        :param size: the maximum number of scores to keep
+        """
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Look up the score stored for a key
+
+        :param key: the key to look up (see Player.evaluation_key)
+        :return: the stored score, or None if there is no such score
+        """
+        score = self.entries.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return score
+
+    def put(self, key, score):
+        """
+        Store the score for a key, discarding the oldest score if full
+
+        :param key: the key to store the score under
+        :param score: the score to store
+        """
+        self.entries[key] = score
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.size:
+            # full, forget the least recently used score
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Discard all stored scores (statistics are kept)
+        """
+        self.entries.clear()
+
+    def stats(self):
+        """
+        Report how well the cache has been performing
+
+        :return: a dictionary of the number of hits, misses and evictions, the
+            number of stored scores and the ratio of hits to look-ups
+        """
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+            'evictions': self.evictions, 'entries': len(self.entries),
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0}
+
+EXACT = 0 # stored score is the node's exact score
+LOWER = 1 # stored score is a lower bound (the search failed high)
+UPPER = 2 # stored score is an upper bound (the search failed low)
+
+class TranspositionTable(EvalCache):
+    """
+    Cache of search results (score, bound and best move for a searched depth),
+    which keeps the least recently used entries out in the same way as
+    EvalCache. Kept between moves, so the next search starts partly done
+    """
+    def store(self, key, depth, score, flag, move):
+        """
+        Store the result of searching a node, unless a deeper result for the
+        same node is already stored
+
+        :param key: the key of the node (see Player.search_key)
+        :param depth: the number of plies searched below the node
+        :param score: the score found (or None, to only store the move)
+        :param flag: EXACT, LOWER or UPPER, describing the score
+        :param move: the best move found, to be searched first next time
+        """
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > depth:
+            # keep the deeper result, but remember the newer move
+            if move is not None:
+                entry[3] = move
+            self.entries.move_to_end(key)
+            return
+        self.put(key, [depth, score, flag, move])
+
+    def probe(self, key, depth, alpha, beta):
+        """
+        Look up a node, checking whether its stored score can be used
+
+        :param key: the key of the node (see Player.search_key)
+        :param depth: the number of plies which need to be searched below it
+        :param alpha: the current minimum score for maximising player
+        :param beta: the current maximum score for minimising player
+        :return: a tuple of the usable score (or None) and the stored best move
+            (or None)
+        """
+        entry = self.get(key)
+        if entry is None:
+            return None, None
+        s_depth, score, flag, move = entry
+        if s_depth >= depth and score is not None:
+            if flag == EXACT:
+                return score, move
+            if flag == LOWER and score >= beta:
+                return score, move
+            if flag == UPPER and score <= alpha:
+                return score, move
+        return None, move
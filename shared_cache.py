@@ -0,0 +1,196 @@
+#-------------------------------------------------------------------------------
+# Name:         shared_cache.py
+# Purpose:      A transposition table kept in shared memory, so that search
+#               workers in several processes can use the same results
+#               Kept apart from search_cache.py, so that players which don't
+#               use it needn't import multiprocessing
+#
+# Author:       Daniel Blain and Anjana Basani
+#
+# Created:      19/10/2026
+#-------------------------------------------------------------------------------
+
+import hashlib
+import struct
+from multiprocessing import shared_memory
+
+from search_cache import EXACT, LOWER, UPPER
+
+SLOT = struct.Struct('<QQ') # a shared entry: check word, then data word
+# fields of the data word: score, depth, flags (bound, and which of the score
+# and move are missing), square of the move's piece (column*8 + row) and
+# index of the move's direction
+DATA = struct.Struct('<iBBBB')
+NO_SCORE = 4 # flag set when the entry doesn't hold a score
+NO_MOVE = 8 # flag set when the entry doesn't hold a move
+DIRECTIONS = ['left', 'right', 'up', 'down'] # as player_functions' moves
+
+class SharedTranspositionTable:
+    """
+    Transposition table kept in shared memory, so that search workers on the
+    same host (processes started by multiprocessing from the one which made
+    the table) all read and write the same results
+    Entries are fixed-size slots (see SLOT), one for each hashed key. Writes
+    aren't locked: the check word of a slot is the key's hash XOR its data
+    word, so an entry half-written by another process (or one for another key)
+    doesn't check out and is treated as missing
+    Used in the same way as TranspositionTable, though its statistics only
+    count this process' look-ups
+    """
+    def __init__(self, size_mb, name=None):
+        """
+        Make a new table, or attach to one made by another process
+
+        :param size_mb: the memory to use (MB); it is all counted against
+            each process' space, so should fit within the referee's limit
+        :param name: the name of an existing table to attach to (see name),
+            or None to make a new one
+        """
+        if name is None:
+            size = int(size_mb * 1024 * 1024) // SLOT.size * SLOT.size
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+            # new shared memory is zeroed, and an all-zero slot never checks
+            # out, as hashes are odd
+        else:
+            self.memory = shared_memory.SharedMemory(name)
+        self.buf = self.memory.buf
+        self.size = len(self.buf) // SLOT.size # the number of slots
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def name(self):
+        """
+        The name other processes attach to the table by
+        """
+        return self.memory.name
+
+    def _hash(self, key):
+        """
+        Hash a key the same way in every process (unlike hash())
+
+        :param key: the key to hash (see Player.search_key)
+        :return: an odd 64-bit hash of the key
+        """
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') | 1
+
+    def _read(self, h):
+        """
+        Read the slot of a hashed key
+
+        :param h: the hash of the key (see _hash)
+        :return: the slot's offset in the buffer, and the entry's data word if
+            it holds this key (None otherwise)
+        """
+        offset = (h % self.size) * SLOT.size
+        check, data = SLOT.unpack_from(self.buf, offset)
+        if check ^ data != h:
+            return offset, None
+        return offset, data
+
+    def store(self, key, depth, score, flag, move):
+        """
+        Store the result of searching a node, unless a deeper result for the
+        same node is already stored. Results for other nodes sharing the slot
+        are replaced
+
+        :param key: the key of the node (see Player.search_key)
+        :param depth: the number of plies searched below the node
+        :param score: the score found (or None, to only store the move)
+        :param flag: EXACT, LOWER or UPPER, describing the score
+        :param move: the best move found, to be searched first next time
+        """
+        h = self._hash(key)
+        offset, data = self._read(h)
+        if data is not None:
+            s_score, s_depth, s_flags, square, d = DATA.unpack(
+                data.to_bytes(8, 'little'))
+            if s_depth > depth:
+                # keep the deeper result, but remember the newer move
+                if move is None:
+                    return
+                depth, score, flag = s_depth, s_score, s_flags & 3
+                if s_flags & NO_SCORE:
+                    score = None
+        elif SLOT.unpack_from(self.buf, offset)[0] != 0:
+            self.evictions += 1
+        flags = flag
+        if score is None:
+            flags |= NO_SCORE
+            score = 0
+        if move is None:
+            flags |= NO_MOVE
+            square, d = 0, 0
+        else:
+            square, d = move[0]*8 + move[1], DIRECTIONS.index(move[2])
+        data = int.from_bytes(DATA.pack(score, depth, flags, square, d),
+            'little')
+        SLOT.pack_into(self.buf, offset, h ^ data, data)
+
+    def probe(self, key, depth, alpha, beta):
+        """
+        Look up a node, checking whether its stored score can be used
+
+        :param key: the key of the node (see Player.search_key)
+        :param depth: the number of plies which need to be searched below it
+        :param alpha: the current minimum score for maximising player
+        :param beta: the current maximum score for minimising player
+        :return: a tuple of the usable score (or None) and the stored best move
+            (or None)
+        """
+        offset, data = self._read(self._hash(key))
+        if data is None:
+            self.misses += 1
+            return None, None
+        self.hits += 1
+        score, s_depth, flags, square, d = DATA.unpack(
+            data.to_bytes(8, 'little'))
+        move = None
+        if not flags & NO_MOVE:
+            move = [square // 8, square % 8, DIRECTIONS[d]]
+        if s_depth >= depth and not flags & NO_SCORE:
+            flag = flags & 3
+            if flag == EXACT:
+                return score, move
+            if flag == LOWER and score >= beta:
+                return score, move
+            if flag == UPPER and score <= alpha:
+                return score, move
+        return None, move
+
+    def clear(self):
+        """
+        Discard all stored results, for every process using the table
+        (statistics are kept)
+        """
+        self.buf[:] = bytes(len(self.buf))
+
+    def stats(self):
+        """
+        Report how well the table has been performing in this process
+
+        :return: a dictionary of the number of hits, misses and evictions, the
+            number of filled slots and the ratio of hits to look-ups
+        """
+        lookups = self.hits + self.misses
+        checks = self.buf.cast('Q')[0::2]
+        return {'hits': self.hits, 'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(checks) - checks.tolist().count(0),
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0}
+
+    def close(self):
+        """
+        Detach this process from the table
+        """
+        self.buf = None
+        self.memory.close()
+
+    def unlink(self):
+        """
+        Free the table's memory, once every process has closed it (only the
+        process which made the table should do this)
+        """
+        self.memory.unlink()
@@ -0,0 +1,135 @@
+#-------------------------------------------------------------------------------
+# Name:         time_manager.py
+# Purpose:      Divides a player's CPU time allowance between the turns of a
+#               game of 'Watch Your Back'
+#
+# Author:       Daniel Blain and Anjana Basani
+#
+# Created:      19/10/2026
+#-------------------------------------------------------------------------------
+
+import time # the referee limits CPU time, i.e. time.process_time()
+
+TIME_LIMIT = 120.0 # CPU time (seconds) the referee allows each player
+TIME_RESERVE = 0.15 # fraction of the time limit never budgeted for
+PLACE_TURNS = 12 # placing turns per player
+MOVE_TURNS = 192 # moving phase turns (both players) planned for
+PLACE_WEIGHT = 2.0 # relative importance of a placing turn
+SHRINK_WEIGHT = 1.5 # relative importance of a turn just before a shrink
+TACTICAL_WEIGHT = 1.5 # extra importance of a turn where pieces can be taken
+DEADLINE_FACTOR = 3.0 # most a turn's search may overrun its budget by
+
+class TimeManager:
+    """Class which budgets CPU time for each of a player's turns"""
+    def __init__(self, limit=TIME_LIMIT, reserve=TIME_RESERVE):
+        """
+        Initialise a time manager for a new game
+
+        :param limit: the total CPU time (seconds) available for the game
+        :param reserve: the fraction of the limit to hold back for safety
+        """
+        self.limit = limit
+        self.reserve = limit * reserve
+        self.used = 0.0 # CPU time used so far
+        self.t_start = None
+
+    def start(self):
+        """
+        Start timing a call made by the referee (action or update)
+        """
+        self.t_start = time.process_time()
+
+    def stop(self):
+        """
+        Stop timing a call made by the referee, adding it to the time used
+
+        :return: the CPU time used by the call
+        """
+        elapsed = time.process_time() - self.t_start
+        self.used += elapsed
+        self.t_start = None
+        return elapsed
+
+    def elapsed(self):
+        """
+        Returns the CPU time used by the call currently being timed
+
+        :return: the time (seconds) since start() was called
+        """
+        if self.t_start is None:
+            return 0.0
+        return time.process_time() - self.t_start
+
+    def remaining(self):
+        """
+        Returns the time left to budget, excluding the safety reserve
+
+        :return: the unreserved CPU time (seconds) still available
+        """
+        return max(self.limit - self.reserve - self.used - self.elapsed(), 0.0)
+
+    def turn_weight(self, turns, placing):
+        """
+        Returns how much time a turn deserves, relative to a quiet moving turn
+
+        :param turns: the number of turns which have passed in the current phase
+        :param placing: whether the turn is in the placing phase
+        :return: the relative weight of the turn
+        """
+        if placing:
+            return PLACE_WEIGHT
+        if turns in range(100, 128) or turns in range(176, 192):
+            # approaching a shrink, pieces must get to safety
+            return SHRINK_WEIGHT
+        return 1.0
+
+    def turns_weight(self, turns, placing, placed):
+        """
+        Returns the total weight of this player's remaining turns, including
+        the current one
+
+        :param turns: the number of turns which have passed in the current phase
+        :param placing: whether the current turn is in the placing phase
+        :param placed: the number of pieces this player has placed
+        :return: the sum of the weights of the remaining turns
+        """
+        w_total = 0.0
+        if placing:
+            w_total += (PLACE_TURNS - placed) * PLACE_WEIGHT
+            t = turns % 2 # moving turns alternate in the same way
+        else:
+            t = turns
+        # this player only has every second moving turn
+        while t < MOVE_TURNS:
+            w_total += self.turn_weight(t, False)
+            t += 2
+        # the game may carry on beyond the planned turns
+        return max(w_total, 4.0)
+
+    def budget(self, turns, placing, placed, tactical=False):
+        """
+        Determines the CPU time this turn may use for searching
+
+        :param turns: the number of turns which have passed in the current phase
+        :param placing: whether the current turn is in the placing phase
+        :param placed: the number of pieces this player has placed
+        :param tactical: whether pieces can be taken in the current position
+        :return: the time (seconds) budgeted for this turn
+        """
+        w_turn = self.turn_weight(turns, placing)
+        if tactical:
+            w_turn *= TACTICAL_WEIGHT
+        w_total = self.turns_weight(turns, placing, placed)
+        # never allow a single turn more than a quarter of what's left
+        return min(self.remaining() * w_turn / w_total, self.remaining() / 4)
+
+    def deadline(self, budget):
+        """
+        Determines when a turn's search must be abandoned, even if it means
+        playing a worse move, so that the time limit is never exceeded
+
+        :param budget: the time budgeted for the turn (see budget)
+        :return: the CPU time (seconds since start() was called) at which to
+            stop searching
+        """
+        return self.elapsed() + min(budget * DEADLINE_FACTOR, self.remaining())
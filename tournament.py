@@ -0,0 +1,396 @@
+#-------------------------------------------------------------------------------
+# Name:         tournament.py
+# Purpose:      Plays round-robin tournaments of 'Watch Your Back' between
+#               player modules (and configurations of them), using the worker
+#               pool of match_server.py, keeping every result in a SQLite file
+#               and rating the players with Elo. Head-to-head matches can stop
+#               early once a sequential probability ratio test (SPRT) decides
+#               Run `python tournament.py -h` for usage information
+#
+# Author:       Daniel Blain and Anjana Basani
+#
+# Created:      19/10/2026
+#-------------------------------------------------------------------------------
+
+import argparse
+import itertools
+import math
+import sqlite3
+import time
+
+from match_server import MatchServer, load_player
+
+DATABASE = 'tournament.db' # default file to keep results in
+PRIOR_DRAWS = 1 # virtual draws added between each pair of players that met,
+                # so that a player who has never lost doesn't rate infinitely
+ELO_ITERATIONS = 200 # most rounds of fitting ratings
+ELO_TOLERANCE = 0.01 # fitting stops once no rating moves further than this
+Z_95 = 1.96 # standard deviations either side for a 95% confidence interval
+LOG10 = math.log(10) / 400 # converts Elo differences to natural log odds
+SCORES = {'W': (1.0, 0.0), 'B': (0.0, 1.0), 'draw': (0.5, 0.5)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    white TEXT NOT NULL,
+    black TEXT NOT NULL,
+    seed INTEGER,
+    winner TEXT,
+    reason TEXT,
+    phase TEXT,
+    turns INTEGER,
+    time_white REAL,
+    time_black REAL,
+    played REAL
+)
+"""
+
+class ResultStore:
+    """Class which keeps the results of games in a SQLite file"""
+    def __init__(self, path=DATABASE):
+        """
+        Open (or create) a results file
+
+        :param path: the file to use
+        """
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    def add(self, result):
+        """
+        Record the result of a game
+
+        :param result: the result, as returned by MatchServer.result
+        """
+        self.conn.execute("INSERT INTO games (white, black, seed, winner, "
+            + "reason, phase, turns, time_white, time_black, played) "
+            + "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (result['white'], result['black'], result['seed'],
+                result['winner'], result['reason'], result['phase'],
+                result['turns'], result['time'].get('white'),
+                result['time'].get('black'), time.time()))
+        self.conn.commit()
+
+    def games(self, players):
+        """
+        Find the finished games played between some players
+
+        :param players: the players (module names and options) to include
+        :return: a list of (white, black, winner) tuples
+        """
+        marks = ', '.join('?' * len(players))
+        return self.conn.execute("SELECT white, black, winner FROM games "
+            + f"WHERE white IN ({marks}) AND black IN ({marks}) "
+            + "AND winner IS NOT NULL", list(players) * 2).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+def expected(r_a, r_b):
+    """
+    Returns the expected score of one player against another
+
+    :param r_a: the player's rating
+    :param r_b: the opponent's rating
+    :return: the expected score (a win counting 1 and a draw 0.5)
+    """
+    return 1 / (1 + math.exp(LOG10 * (r_b - r_a)))
+
+def ratings(players, games):
+    """
+    Fits Elo ratings to the results of games, by maximum likelihood, with
+    PRIOR_DRAWS virtual draws between each pair of players that met
+
+    :param players: the players to rate
+    :param games: a list of (white, black, winner) tuples, as returned by
+        ResultStore.games
+    :return: a dictionary mapping each player to a dictionary of its
+        'rating' (the ratings average 0), the 'error' of the rating (half the
+        width of its 95% confidence interval, ignoring the uncertainty of the
+        other ratings), 'games' played and total 'score'
+    """
+    # games and score between each ordered pair of players
+    played = {}
+    scored = {}
+    for white, black, winner in games:
+        s_white, s_black = SCORES[winner]
+        for a, b, s in [(white, black, s_white), (black, white, s_black)]:
+            played[(a, b)] = played.get((a, b), 0) + 1
+            scored[(a, b)] = scored.get((a, b), 0) + s
+    for (a, b) in list(played):
+        played[(a, b)] += PRIOR_DRAWS
+        scored[(a, b)] += PRIOR_DRAWS / 2
+    r = {p: 0.0 for p in players}
+    for i in range(ELO_ITERATIONS):
+        moved = 0
+        for p in players:
+            # one Newton step on this player's rating
+            gradient = 0
+            information = 0
+            for (a, b), n in played.items():
+                if a != p:
+                    continue
+                e = expected(r[a], r[b])
+                gradient += scored[(a, b)] - n*e
+                information += n * e * (1-e) * LOG10
+            if information > 0:
+                step = gradient / information
+                r[p] += step
+                moved = max(moved, abs(step))
+        mean = sum(r.values()) / len(r)
+        for p in players:
+            r[p] -= mean
+        if moved < ELO_TOLERANCE:
+            break
+    results = {}
+    for p in players:
+        information = 0
+        n_games = 0
+        score = 0
+        for (a, b), n in played.items():
+            if a == p:
+                e = expected(r[a], r[b])
+                information += n * e * (1-e) * LOG10 * LOG10
+                n_games += n - PRIOR_DRAWS
+                score += scored[(a, b)] - PRIOR_DRAWS/2
+        error = Z_95 / math.sqrt(information) if information > 0 else math.inf
+        results[p] = {'rating': r[p], 'error': error, 'games': n_games,
+            'score': score}
+    return results
+
+def sprt_llr(wins, draws, losses, elo0, elo1):
+    """
+    Approximates the log-likelihood ratio of a match result, between the
+    hypotheses that the first player is elo1 stronger than its opponent (H1)
+    and that it is elo0 stronger (H0), using the normal approximation of the
+    mean score. As in ratings, PRIOR_DRAWS virtual draws are added, so that
+    the variance is never zero
+
+    :param wins: the first player's wins
+    :param draws: the number of draws
+    :param losses: the first player's losses
+    :param elo0: the Elo difference of H0
+    :param elo1: the Elo difference of H1
+    :return: the log-likelihood ratio (positive values favour H1)
+    """
+    draws += PRIOR_DRAWS
+    n = wins + draws + losses
+    w = wins / n
+    d = draws / n
+    s = w + d/2 # mean score
+    variance = (w + d/4 - s*s) / n # of the mean score
+    s0 = expected(elo0, 0)
+    s1 = expected(elo1, 0)
+    return (s1 - s0) * (2*s - s0 - s1) / (2*variance)
+
+def sprt_bounds(alpha, beta):
+    """
+    Returns the bounds at which an SPRT stops
+
+    :param alpha: the chance of accepting H1 when H0 is true
+    :param beta: the chance of accepting H0 when H1 is true
+    :return: a tuple of the lower bound (accept H0) and the upper bound
+        (accept H1) of the log-likelihood ratio
+    """
+    return (math.log(beta / (1-alpha)), math.log((1-beta) / alpha))
+
+def pairings(players, games):
+    """
+    Lists the games of a round robin, where each pair of players plays the
+    same number of games with each colour
+
+    :param players: the players taking part
+    :param games: the number of games each pair plays (rounded up to even)
+    :return: a list of (white, black) pairs, with every pair's first games
+        before any pair's later games
+    """
+    l_games = []
+    for k in range((games + 1) // 2):
+        for a, b in itertools.combinations(players, 2):
+            l_games.append((a, b))
+            l_games.append((b, a))
+    return l_games
+
+def round_robin(server, store, players, games, seed=0, time_limit=0,
+        space_limit=0, verbose=True):
+    """
+    Plays a round-robin tournament, recording each game as it finishes
+
+    :param server: the MatchServer to play games with
+    :param store: the ResultStore to record games in
+    :param players: the players taking part (module names and options)
+    :param games: the number of games each pair plays (see pairings)
+    :param seed: the random seed of the first pair of games (each game and
+        its colour-swapped twin share a seed, and later pairs count up)
+    :param time_limit: limit on CPU time (seconds) for each player
+    :param space_limit: limit on memory space (MB) for each player
+    :param verbose: whether to print each result
+    :return: the number of games played
+    """
+    l_games = pairings(players, games)
+    for k, (white, black) in enumerate(l_games):
+        server.submit(white, black, seed + k//2, time_limit, space_limit)
+    for k in range(len(l_games)):
+        result = server.result()
+        store.add(result)
+        if verbose:
+            print_game(result)
+    return len(l_games)
+
+def sprt_match(server, store, player, opponent, elo0, elo1, alpha, beta,
+        games_max, seed=0, time_limit=0, space_limit=0, verbose=True):
+    """
+    Plays a head-to-head match in pairs of games (one with each colour, from
+    the same seed) until an SPRT decides whether the player is elo1 stronger
+    than its opponent (H1) or only elo0 (H0)
+    Only enough games to keep every worker busy are queued at once, so little
+    is wasted once the test decides
+
+    :param server: the MatchServer to play games with
+    :param store: the ResultStore to record games in
+    :param player: the player being tested (module name and options)
+    :param opponent: the player it is tested against
+    :param elo0: the Elo difference of H0
+    :param elo1: the Elo difference of H1
+    :param alpha: the chance of accepting H1 when H0 is true
+    :param beta: the chance of accepting H0 when H1 is true
+    :param games_max: the most games to play before giving up
+    :param seed: the random seed of the first pair of games (later pairs
+        count up)
+    :param time_limit: limit on CPU time (seconds) for each player
+    :param space_limit: limit on memory space (MB) for each player
+    :param verbose: whether to print each result
+    :return: a dictionary of the player's 'wins', 'draws' and 'losses', the
+        final 'llr', and the 'decision' ('H1', 'H0' or None if undecided)
+    """
+    lower, upper = sprt_bounds(alpha, beta)
+    r = {'wins': 0, 'draws': 0, 'losses': 0, 'llr': 0.0, 'decision': None}
+    queued = 0
+    done = 0
+    pairs = 0
+    while done < games_max and r['decision'] is None:
+        while queued - done < 2*len(server.workers) and queued < games_max:
+            server.submit(player, opponent, seed + pairs, time_limit,
+                space_limit)
+            queued += 1
+            if queued < games_max:
+                # the same game with colours swapped, unless over the limit
+                server.submit(opponent, player, seed + pairs, time_limit,
+                    space_limit)
+                queued += 1
+            pairs += 1
+        result = server.result()
+        done += 1
+        store.add(result)
+        if verbose:
+            print_game(result)
+        if result['winner'] is None:
+            continue
+        colour = 'W' if result['white'] == player else 'B'
+        if result['winner'] == colour:
+            r['wins'] += 1
+        elif result['winner'] == 'draw':
+            r['draws'] += 1
+        else:
+            r['losses'] += 1
+        r['llr'] = sprt_llr(r['wins'], r['draws'], r['losses'], elo0, elo1)
+        if r['llr'] >= upper:
+            r['decision'] = 'H1'
+        elif r['llr'] <= lower:
+            r['decision'] = 'H0'
+    # games still being played are recorded, but don't count towards the test
+    for k in range(queued - done):
+        store.add(server.result())
+    return r
+
+def print_game(result):
+    """
+    Prints the result of a game
+
+    :param result: the result, as returned by MatchServer.result
+    """
+    print(f"{result['white']} v {result['black']} (seed {result['seed']}): "
+        + f"winner {result['winner']} after {result['turns']} turns"
+        + (f" ({result['reason']})" if result['reason'] else ""))
+
+def print_ratings(results):
+    """
+    Prints the results of ratings() as a table, strongest first
+
+    :param results: the results to print
+    """
+    width = max([len(p) for p in results] + [6])
+    print(f"{'player':<{width}}{'elo':>8}{'95% ci':>10}{'games':>8}"
+        + f"{'score':>8}")
+    for p, r in sorted(results.items(), key=lambda x: -x[1]['rating']):
+        score = r['score'] / r['games'] if r['games'] > 0 else 0
+        print(f"{p:<{width}}{r['rating']:>8.0f}{'+/-':>5}{r['error']:>5.0f}"
+            + f"{r['games']:>8}{score:>8.1%}")
+
+def main():
+    """Run the tournament or match described on the command line"""
+    parser = argparse.ArgumentParser(
+        description="Plays a round-robin tournament of Watch Your Back! and "
+            "rates the players")
+    parser.add_argument('players', nargs='+',
+        help="player modules, each with any options to set on its players "
+            "(e.g. ai_player:lmr=False)")
+    parser.add_argument('-n', '--games', type=int, default=10,
+        help="games each pair plays (half with each colour), or the most "
+            "games of an SPRT match")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+        help="number of worker processes (default: one per CPU)")
+    parser.add_argument('--db', default=DATABASE,
+        help="SQLite file to keep results in (results already in it are "
+            "included in the ratings)")
+    parser.add_argument('--seed', type=int, default=0,
+        help="random seed of the first pair of games (later pairs count up "
+            "from it)")
+    parser.add_argument('-s', '--space_limit', type=float, default=0,
+        help="limit on memory space (float, MB) for each player")
+    parser.add_argument('-t', '--time_limit', type=float, default=0,
+        help="limit on CPU time (float, seconds) for each player")
+    parser.add_argument('--sprt', nargs=2, type=float, metavar=('ELO0', 'ELO1'),
+        help="play the first two players head-to-head until an SPRT decides "
+            "whether the first is ELO1 stronger, or only ELO0")
+    parser.add_argument('--alpha', type=float, default=0.05,
+        help="chance of the SPRT wrongly accepting ELO1")
+    parser.add_argument('--beta', type=float, default=0.05,
+        help="chance of the SPRT wrongly accepting ELO0")
+    args = parser.parse_args()
+    if args.sprt is not None and len(args.players) != 2:
+        parser.error("--sprt needs exactly two players")
+    if len(set(args.players)) < 2:
+        parser.error("at least two different players are needed")
+    for p in args.players:
+        # check each player's options before playing any games
+        try:
+            load_player(p)
+        except (ImportError, AttributeError, ValueError) as e:
+            parser.error(f"{p}: {e}")
+
+    store = ResultStore(args.db)
+    server = MatchServer(args.workers, [p.partition(':')[0]
+        for p in args.players])
+    try:
+        if args.sprt is not None:
+            r = sprt_match(server, store, args.players[0], args.players[1],
+                args.sprt[0], args.sprt[1], args.alpha, args.beta, args.games,
+                args.seed, args.time_limit, args.space_limit)
+            lower, upper = sprt_bounds(args.alpha, args.beta)
+            print(f"W {r['wins']} D {r['draws']} L {r['losses']}, "
+                + f"LLR {r['llr']:.2f} ({lower:.2f}, {upper:.2f}): "
+                + {'H1': f"accept ELO1 ({args.sprt[1]:g})",
+                    'H0': f"accept ELO0 ({args.sprt[0]:g})",
+                    None: "undecided"}[r['decision']])
+        else:
+            round_robin(server, store, args.players, args.games, args.seed,
+                args.time_limit, args.space_limit)
+    finally:
+        server.close()
+    print_ratings(ratings(args.players, store.games(args.players)))
+    store.close()
+
+if __name__ == '__main__':
+    main()